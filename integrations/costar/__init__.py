@@ -3,6 +3,21 @@
 Architecture:
 - session.py: Browser session management (Pydoll for stealth)
 - client.py: CoStar API calls
+- ratelimit.py: Token bucket shared by all clients on a session's tab
+- cache.py: Disk-backed TTL cache for PDS, contacts and parcel responses
+- partition.py: Splits payloads that exceed the per-search result cap
+- adaptive.py: AIMD controller for in-flight property requests
+- circuit.py: Per-endpoint circuit breakers shared by a session's clients
+- deadletter.py: Persistent list of failed properties for later retry
+- metrics.py: Per-endpoint request metrics (Prometheus text format)
+- standin.py: Local fake CoStar server + tab adapter for offline benchmarks
+- cassette.py: Record/replay of client traffic to compressed cassette files
+- sinks.py: Destinations for streamed contacts (NDJSON, file, batched callback)
+- checkpoint.py: SQLite run checkpoints so long extractions can resume
+- dedupe.py: Cross-payload property index with payload attribution
+- transport.py: Direct HTTP/2 transport using the browser session's cookies
+- pool.py: Several tabs on one login with least-loaded request dispatch
+- lean.py: Lean-browser request blocking, memory flags and resource stats
 - queries/: Query modules that return JSON (no DB interaction)
     - find_sellers.py: Extract property owner contacts
     - find_buyers.py: Extract active buyers (TODO)
@@ -58,6 +73,7 @@ async def extract_contacts(
     max_delay: float = 0.4,
     burst_size: int = 150,
     burst_delay: float = 3.0,
+    batch_size: int = 1,
 ) -> List[Dict]:
     """Extract property owner contacts from CoStar search payloads.
 
@@ -82,6 +98,7 @@ async def extract_contacts(
         max_delay: Maximum delay between requests in seconds
         burst_size: Number of properties before taking a burst pause
         burst_delay: Seconds to pause between bursts
+        batch_size: Properties packed into one aliased contacts request (1 = off)
     """
     payload_list = [payloads] if isinstance(payloads, dict) else payloads
 
@@ -105,6 +122,7 @@ async def extract_contacts(
             max_delay=max_delay,
             burst_size=burst_size,
             burst_delay=burst_delay,
+            batch_size=batch_size,
         )
         contacts = await extractor.extract_from_payloads(payload_list, max_properties)
 
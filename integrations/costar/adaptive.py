@@ -0,0 +1,147 @@
+"""CoStar Adaptive Concurrency - AIMD limit on in-flight property requests."""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN = 1
+DEFAULT_MAX = 16
+TARGET_P95 = 2.5  # Seconds; above this the limit stops growing
+MAX_ERROR_RATE = 0.05
+WINDOW = 20  # Responses per increase decision
+DECREASE_FACTOR = 0.5
+DECREASE_COOLDOWN = 5.0  # Seconds between multiplicative cuts
+DECISION_HISTORY = 50
+
+
+def _is_throttle(status: Optional[int]) -> bool:
+    """429s, 5xx and missing responses (timeouts) mean CoStar is pushing back."""
+    return status is None or status == 429 or status >= 500
+
+
+class AdaptiveConcurrency:
+    """Additive-increase / multiplicative-decrease concurrency limit.
+
+    Used in place of an asyncio.Semaphore (`async with controller:`). Register
+    `record` as a CoStarClient listener: every healthy window of responses
+    (p95 latency and error rate under target) raises the limit by one, and
+    any 429/5xx/timeout halves it, at most once per cooldown.
+    """
+
+    def __init__(
+        self,
+        initial: int = 3,
+        minimum: int = DEFAULT_MIN,
+        maximum: int = DEFAULT_MAX,
+        target_p95: float = TARGET_P95,
+        max_error_rate: float = MAX_ERROR_RATE,
+        window: int = WINDOW,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = min(max(initial, self.minimum), self.maximum)
+        self.target_p95 = target_p95
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self.decisions: Deque[Dict] = deque(maxlen=DECISION_HISTORY)
+        self._samples: List[Tuple[float, bool]] = []
+        self._last_decrease = 0.0
+        self._last_p95: Optional[float] = None
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    async def __aenter__(self):
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return self
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just as we were cancelled
+                self._release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._release()
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def record(self, endpoint: str, status: Optional[int], latency: float):
+        """Feed one response outcome into the controller."""
+        throttled = _is_throttle(status)
+        self._samples.append((latency, not throttled and status < 400))
+
+        if throttled:
+            now = time.monotonic()
+            if now - self._last_decrease >= DECREASE_COOLDOWN:
+                self._last_decrease = now
+                self._decide("decrease", max(self.minimum, math.floor(self.limit * DECREASE_FACTOR)),
+                             f"{endpoint} returned {status or 'no response'}")
+                self._samples = []
+            return
+
+        if len(self._samples) >= self.window:
+            latencies = sorted(sample[0] for sample in self._samples)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            error_rate = sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+            self._last_p95 = p95
+            self._samples = []
+
+            if p95 <= self.target_p95 and error_rate <= self.max_error_rate and self.limit < self.maximum:
+                self._decide("increase", self.limit + 1, f"p95={p95:.2f}s errors={error_rate:.0%}")
+            elif p95 > self.target_p95:
+                self._decide("hold", self.limit, f"p95={p95:.2f}s over target {self.target_p95}s")
+
+    def _decide(self, action: str, new_limit: int, reason: str):
+        if action == "increase":
+            self.increases += 1
+        elif action == "decrease":
+            self.decreases += 1
+            logger.info(f"Concurrency {self.limit} -> {new_limit}: {reason}")
+
+        self.decisions.append({
+            "at": time.time(),
+            "action": action,
+            "from": self.limit,
+            "to": new_limit,
+            "reason": reason,
+        })
+        self.limit = new_limit
+        self._wake()
+
+    def snapshot(self) -> Dict:
+        """Current limit and recent decisions, for status/metrics output."""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "last_p95": round(self._last_p95, 3) if self._last_p95 is not None else None,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "recent_decisions": list(self.decisions)[-10:],
+        }
@@ -0,0 +1,229 @@
+"""CoStar Response Cache - SQLite-backed TTL cache with an in-memory LRU in front."""
+
+import atexit
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path("session") / "costar_cache.sqlite"
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# Per-endpoint TTLs in seconds. GraphQL endpoints are keyed by operation name;
+# anything without a TTL here is never cached.
+DEFAULT_TTLS: Dict[str, float] = {
+    "pds": 7 * DAY,
+    "ContactsDetail": 1 * DAY,
+    "parcelPinsFromProperty": 30 * DAY,
+    "Parcel_Info": 30 * DAY,  # Sale/loan records change rarely
+    "owner_contacts": 7 * DAY,  # TrueOwner rosters by company ID (see ContactExtractor)
+    "no_contacts": 90 * DAY,  # Properties with no usable contact; readers apply their own expiry
+}
+
+MEMORY_ENTRIES = 2000
+MAX_DISK_ENTRIES = 200_000
+EVICTION_CHECK_EVERY = 500  # Writes between disk size checks
+COMMIT_EVERY = 100  # Writes batched into one SQLite transaction
+COMMIT_SECONDS = 5.0  # Longest an uncommitted write or access time is held
+
+
+def cache_key(endpoint: str, variables: Dict[str, Any]) -> str:
+    """Stable key for an endpoint + variables pair, independent of dict order."""
+    canonical = json.dumps(variables, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{endpoint}:{canonical}".encode()).hexdigest()
+
+
+class ResponseCache:
+    """Caches CoStar responses per endpoint with TTLs and size-bounded eviction.
+
+    Lookups hit the in-memory LRU first, then SQLite. `bypass=True` skips
+    reads but still writes fresh responses, which is how a forced refresh
+    repopulates the cache. Pass `path=None` for a memory-only cache.
+
+    Writes and access-time updates are batched: they are committed every
+    COMMIT_EVERY writes or COMMIT_SECONDS, on `flush()`/`close()`, and at
+    interpreter exit, so a hit never pays for a disk commit.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = DEFAULT_CACHE_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        memory_entries: int = MEMORY_ENTRIES,
+        max_entries: int = MAX_DISK_ENTRIES,
+        bypass: bool = False,
+    ):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._accessed: Dict[str, float] = {}
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+        if path:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Service jobs run on the session loop thread, handlers on Flask threads
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+            self._conn.commit()
+            atexit.register(self.flush)
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        return self.ttls.get(endpoint)
+
+    def get(self, endpoint: str, variables: Dict[str, Any]) -> Optional[Any]:
+        """Return the cached value, or None on miss, expiry, bypass or no TTL."""
+        if not self.ttl_for(endpoint) or self.bypass:
+            return None
+
+        key = cache_key(endpoint, variables)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return json.loads(entry[1])
+
+            if self._conn:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    self._accessed[key] = now
+                    self._maybe_commit()
+                    self._remember(key, row[1], row[0])
+                    self.hits += 1
+                    return json.loads(row[0])
+
+            self.misses += 1
+            return None
+
+    def set(self, endpoint: str, variables: Dict[str, Any], value: Any):
+        """Store a response if the endpoint has a TTL configured."""
+        ttl = self.ttl_for(endpoint)
+        if not ttl:
+            return
+
+        key = cache_key(endpoint, variables)
+        now = time.time()
+        encoded = json.dumps(value, default=str)
+
+        with self._lock:
+            self._remember(key, now + ttl, encoded)
+            self.writes += 1
+
+            if self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, endpoint, value, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, endpoint, encoded, now + ttl, now),
+                )
+                self._accessed.pop(key, None)
+                self._uncommitted += 1
+                if self.writes % EVICTION_CHECK_EVERY == 0:
+                    self._evict(now)
+                self._maybe_commit()
+
+    def invalidate(self, endpoint: Optional[str] = None):
+        """Drop every entry, or only those for one endpoint."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn:
+                self._accessed.clear()
+                if endpoint:
+                    self._conn.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+                else:
+                    self._conn.execute("DELETE FROM responses")
+                self._commit()
+
+    def stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "memory_entries": len(self._memory),
+            "bypass": self.bypass,
+        }
+
+    def flush(self):
+        """Commit batched writes and access times now."""
+        with self._lock:
+            if self._conn:
+                self._commit()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+        atexit.unregister(self.flush)
+
+    def _maybe_commit(self):
+        if (self._uncommitted >= COMMIT_EVERY
+                or (self._uncommitted or self._accessed) and time.monotonic() - self._last_commit >= COMMIT_SECONDS):
+            self._commit()
+
+    def _commit(self):
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(at, key) for key, at in self._accessed.items()],
+            )
+            self._accessed.clear()
+        self._conn.commit()
+        self._uncommitted = 0
+        self._last_commit = time.monotonic()
+
+    def _remember(self, key: str, expires_at: float, encoded: str):
+        self._memory[key] = (expires_at, encoded)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float):
+        """Delete expired rows, then least-recently-used rows over the size bound."""
+        self._commit()  # Flush pending access times so LRU order is current
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            logger.info(f"Cache evicted {excess} least-recently-used entries")
+        self._commit()
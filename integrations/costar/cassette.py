@@ -0,0 +1,191 @@
+"""CoStar Cassettes - Record CoStarClient traffic and replay it without CoStar.
+
+A cassette is a gzip-compressed JSONL file with one line per HTTP exchange:
+endpoint label, canonical request hash, status, body and elapsed time.
+Recording wraps the real tab and passes every request through; replay
+serves the recorded responses back, optionally sleeping the original
+elapsed time scaled by `time_scale` (0 = as fast as possible).
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Union
+from urllib.parse import urlparse
+
+from .cache import cache_key
+from .client import _operation_name, response_status
+
+logger = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMissError(Exception):
+    """Replay got a request that the cassette has no recording for."""
+
+
+def _endpoint_label(url: str, body: Optional[Dict]) -> str:
+    path = urlparse(url).path
+    if path.endswith("/graphql"):
+        return f"graphql:{_operation_name((body or {}).get('query', '')) or 'anonymous'}"
+    if path.startswith("/pds/properties"):
+        return "pds"
+    return path.rsplit("/", 1)[-1] or path
+
+
+def request_key(method: str, url: str, body: Optional[Dict]) -> str:
+    """Canonical hash of one request, independent of dict order."""
+    return cache_key(f"{method.upper()} {urlparse(url).path}", body or {})
+
+
+class CassetteResponse:
+    """Replayed response with the attributes CoStarClient reads."""
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.ok = 200 <= status_code < 300
+        self.content = content
+        self.text = content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text or "null")
+
+
+class Cassette:
+    """Record or replay the HTTP exchanges of a CoStarClient.
+
+    Record:  client = CoStarClient(tab, cassette=Cassette(path, "record"))
+    Replay:  client = CoStarClient(None, cassette=Cassette(path, "replay", time_scale=0))
+
+    Identical requests are replayed in recorded order, so a 429 followed by
+    a successful retry plays back the same way; once a request's recordings
+    are used up, the last one keeps being served.
+    """
+
+    def __init__(self, path: Union[str, Path], mode: str = REPLAY, time_scale: float = 1.0):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Cassette mode must be '{RECORD}' or '{REPLAY}', got {mode!r}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.time_scale = time_scale
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._file = None
+        self._entries: Dict[str, Deque[Dict]] = defaultdict(deque)
+        self._last: Dict[str, Dict] = {}
+
+        if mode == RECORD:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = gzip.open(self.path, "wt", encoding="utf-8")
+        else:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def _load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+        total = sum(len(q) for q in self._entries.values())
+        logger.info(f"Loaded cassette {self.path}: {total} exchanges, {len(self._entries)} distinct requests")
+
+    def wrap(self, tab) -> "CassetteTab":
+        return CassetteTab(self, tab)
+
+    def write(self, method: str, url: str, body: Optional[Dict], response, elapsed: float):
+        content = getattr(response, "content", None) or getattr(response, "text", None) or b""
+        if isinstance(content, bytes):
+            content = content.decode("utf-8", errors="replace")
+
+        entry = {
+            "endpoint": _endpoint_label(url, body),
+            "key": request_key(method, url, body),
+            "status": response_status(response),
+            "body": content,
+            "elapsed": round(elapsed, 4),
+        }
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.recorded += 1
+
+    async def play(self, method: str, url: str, body: Optional[Dict]) -> CassetteResponse:
+        key = request_key(method, url, body)
+        queue = self._entries.get(key)
+        if queue:
+            entry = queue.popleft()
+            self._last[key] = entry
+        elif key in self._last:
+            entry = self._last[key]
+        else:
+            self.misses += 1
+            raise CassetteMissError(f"No recording for {method.upper()} {_endpoint_label(url, body)} ({key[:12]})")
+
+        if self.time_scale > 0:
+            await asyncio.sleep(entry["elapsed"] * self.time_scale)
+        self.replayed += 1
+        return CassetteResponse(entry["status"] or 0, entry["body"].encode("utf-8"))
+
+    def stats(self) -> Dict:
+        return {
+            "path": str(self.path),
+            "mode": self.mode,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+            logger.info(f"Recorded {self.recorded} exchanges to {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _CassetteRequests:
+    def __init__(self, cassette: Cassette, tab):
+        self.cassette = cassette
+        self.tab = tab
+
+    async def _exchange(self, method: str, url: str, body: Optional[Dict], **kwargs):
+        if self.cassette.replaying:
+            return await self.cassette.play(method, url, body)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if method == "get":
+            response = await self.tab.request.get(url, **kwargs)
+        else:
+            response = await self.tab.request.post(url, json=body, **kwargs)
+        self.cassette.write(method, url, body, response, loop.time() - started)
+        return response
+
+    async def post(self, url: str, json: Optional[Dict] = None, **kwargs):
+        return await self._exchange("post", url, json, **kwargs)
+
+    async def get(self, url: str, **kwargs):
+        return await self._exchange("get", url, None, **kwargs)
+
+
+class CassetteTab:
+    """Tab stand-in that routes `.request.get/post` through a cassette."""
+
+    def __init__(self, cassette: Cassette, tab=None):
+        self.cassette = cassette
+        self.tab = tab
+        self.request = _CassetteRequests(cassette, tab)
@@ -0,0 +1,150 @@
+"""CoStar Checkpoints - Persisted progress so long extractions can resume."""
+
+import logging
+import sqlite3
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = Path("session") / "costar_checkpoints.sqlite"
+CHECKPOINT_EVERY = 100  # Properties between checkpoint writes
+
+RUNNING = "running"
+COMPLETE = "complete"
+
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class RunCheckpoint:
+    """Everything needed to pick a run back up where it stopped."""
+
+    run_id: str
+    payload_hash: str
+    status: str
+    pins_fetched: int = 0
+    completed: Set[int] = field(default_factory=set)
+    failed: Set[int] = field(default_factory=set)
+    seen_emails: Set[str] = field(default_factory=set)
+
+
+class CheckpointStore:
+    """SQLite record of each extraction run's finished properties and emitted emails.
+
+    Writes are incremental: `save` only inserts what changed since the last
+    checkpoint, so checkpointing a 10k-property run stays cheap.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CHECKPOINT_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                payload_hash TEXT NOT NULL,
+                status TEXT NOT NULL,
+                pins_fetched INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS run_properties (
+                run_id TEXT NOT NULL,
+                property_id INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                PRIMARY KEY (run_id, property_id)
+            );
+            CREATE TABLE IF NOT EXISTS run_emails (
+                run_id TEXT NOT NULL,
+                email TEXT NOT NULL,
+                PRIMARY KEY (run_id, email)
+            );
+        """)
+        self._conn.commit()
+
+    def start_run(self, payload_hash: str, run_id: Optional[str] = None) -> str:
+        run_id = run_id or uuid.uuid4().hex[:12]
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, payload_hash, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, payload_hash, RUNNING, now, now),
+            )
+            self._conn.commit()
+        return run_id
+
+    def load(self, run_id: str) -> Optional[RunCheckpoint]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload_hash, status, pins_fetched FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            if not row:
+                return None
+            checkpoint = RunCheckpoint(run_id=run_id, payload_hash=row[0], status=row[1], pins_fetched=row[2])
+            for property_id, state in self._conn.execute(
+                "SELECT property_id, state FROM run_properties WHERE run_id = ?", (run_id,)
+            ):
+                (checkpoint.completed if state == DONE else checkpoint.failed).add(property_id)
+            checkpoint.seen_emails = {
+                email for (email,) in self._conn.execute("SELECT email FROM run_emails WHERE run_id = ?", (run_id,))
+            }
+        return checkpoint
+
+    def save(
+        self,
+        run_id: str,
+        pins_fetched: int,
+        completed: Iterable[int] = (),
+        failed: Iterable[int] = (),
+        emails: Iterable[str] = (),
+        status: str = RUNNING,
+    ):
+        """Record progress since the last save (completed wins over an earlier failure)."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO run_properties (run_id, property_id, state) VALUES (?, ?, ?)",
+                [(run_id, pid, DONE) for pid in completed] + [(run_id, pid, FAILED) for pid in failed],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO run_emails (run_id, email) VALUES (?, ?)",
+                [(run_id, email) for email in emails],
+            )
+            self._conn.execute(
+                "UPDATE runs SET pins_fetched = ?, status = ?, updated_at = ? WHERE run_id = ?",
+                (pins_fetched, status, datetime.now().isoformat(), run_id),
+            )
+            self._conn.commit()
+
+    def runs(self, limit: int = 20) -> List[Dict]:
+        """Most recent runs with their progress counts."""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT r.run_id, r.status, r.pins_fetched, r.updated_at,
+                       SUM(p.state = 'done'), SUM(p.state = 'failed')
+                FROM runs r LEFT JOIN run_properties p ON p.run_id = r.run_id
+                GROUP BY r.run_id ORDER BY r.updated_at DESC LIMIT ?
+                """,
+                (limit,),
+            ).fetchall()
+        return [
+            {
+                "run_id": row[0],
+                "status": row[1],
+                "pins_fetched": row[2],
+                "updated_at": row[3],
+                "completed": row[4] or 0,
+                "failed": row[5] or 0,
+            }
+            for row in rows
+        ]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,153 @@
+"""CoStar Circuit Breakers - Stop hammering an endpoint that keeps failing."""
+
+import logging
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = 5  # Consecutive failures before the circuit opens
+RESET_TIMEOUT = 30.0  # Seconds open before a single probe request is allowed
+AUTH_STATUSES = (401, 403)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while an endpoint's circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float, needs_reauth: bool):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        self.needs_reauth = needs_reauth
+        reason = "session needs re-auth" if needs_reauth else "too many failures"
+        super().__init__(f"Circuit open for {endpoint} ({reason}), retry in {retry_in:.0f}s")
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open probe after a timeout."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.last_status: Optional[int] = None
+        self.auth_failure = False
+        self._opened_at = 0.0
+        self._probing = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def check(self):
+        """Raise CircuitOpenError unless a request may go out now."""
+        if self.state == CLOSED:
+            return
+
+        if self.state == OPEN and self.retry_in() == 0:
+            self.state = HALF_OPEN
+            self._probing = False
+
+        # Half-open lets exactly one probe through; everyone else waits
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+
+        raise CircuitOpenError(self.endpoint, self.retry_in() or self.reset_timeout, self.auth_failure)
+
+    def record_success(self):
+        if self.state != CLOSED:
+            logger.info(f"Circuit for {self.endpoint} closed")
+        self.state = CLOSED
+        self.failures = 0
+        self.auth_failure = False
+        self._probing = False
+
+    def record_failure(self, status: Optional[int]) -> bool:
+        """Count a failure; returns True if this failure tripped the circuit."""
+        self.failures += 1
+        self.last_status = status
+        if status in AUTH_STATUSES:
+            self.auth_failure = True
+
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            self._probing = False
+            self.trips += 1
+            logger.warning(
+                f"Circuit for {self.endpoint} opened after {self.failures} failures "
+                f"(last status {status or 'no response'})"
+            )
+            return True
+        return False
+
+    def abandon(self):
+        """A request was cancelled before any answer; a half-open probe slot is freed."""
+        self._probing = False
+
+    def reset(self):
+        self.record_success()
+
+    def snapshot(self) -> Dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "last_status": self.last_status,
+            "auth_failure": self.auth_failure,
+            "retry_in": round(self.retry_in(), 1) if self.state == OPEN else 0,
+        }
+
+
+class CircuitBreakers:
+    """One breaker per endpoint, shared by every client on a session."""
+
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        if endpoint not in self._breakers:
+            self._breakers[endpoint] = CircuitBreaker(endpoint, self.failure_threshold, self.reset_timeout)
+        return self._breakers[endpoint]
+
+    def check(self, endpoint: str):
+        self.get(endpoint).check()
+
+    def record(self, endpoint: str, status: Optional[int], ok: bool):
+        breaker = self.get(endpoint)
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure(status)
+
+    def abandon(self, endpoint: str):
+        self.get(endpoint).abandon()
+
+    @property
+    def needs_reauth(self) -> bool:
+        return any(b.state != CLOSED and b.auth_failure for b in self._breakers.values())
+
+    def reset(self):
+        """Close every circuit, e.g. after the session re-authenticates."""
+        for breaker in self._breakers.values():
+            breaker.reset()
+
+    def snapshot(self) -> Dict:
+        return {endpoint: b.snapshot() for endpoint, b in self._breakers.items()}
@@ -2,8 +2,20 @@
 
 import asyncio
 import logging
+import math
+import re
+import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .cache import DEFAULT_TTLS, ResponseCache, cache_key
+from .circuit import CircuitBreakers, CircuitOpenError
+from .metrics import ClientMetrics
+from .ratelimit import TokenBucket
+from .transport import HttpTransport
+
+if TYPE_CHECKING:
+    from .cassette import Cassette
 
 logger = logging.getLogger(__name__)
 
@@ -12,21 +24,151 @@ PROPERTY_SEARCH_URL = "https://product.costar.com/bff2/property/search/list-prop
 PROPERTY_COUNT_URL = "https://product.costar.com/bff2/property/search/count"
 PROPERTY_DETAILS_URL = "https://product.costar.com/pds/properties"
 
+PAGE_SIZE = 2000  # Rows per list-properties page
+
 MAX_RETRIES = 3
 RETRY_DELAY = 2.0
+PAGE_RETRIES = 2  # Extra attempts for a page that failed in a concurrent search
 REQUEST_TIMEOUT = 30
 
+_OPERATION_NAME = re.compile(r"^\s*query\s+(\w+)")
 
-class CoStarClient:
-    """API client for CoStar GraphQL and REST endpoints."""
 
-    def __init__(self, tab, rate_limit: float = 0.2):
-        self.tab = tab
+class IncompleteSearchError(Exception):
+    """Raised when a concurrent search still has failed pages after retrying them."""
+
+    def __init__(self, failed_pages: List[int], total_pages: int):
+        self.failed_pages = failed_pages
+        self.total_pages = total_pages
+        super().__init__(f"Search incomplete: pages {failed_pages} of {total_pages} failed")
+
+
+def response_status(response) -> Optional[int]:
+    """HTTP status of a tab, transport or cassette response; None when there is none.
+
+    Pydoll responses expose `status_code`; `status` is read as a fallback.
+    """
+    if not response:
+        return None
+    status = getattr(response, "status_code", None)
+    return status if status is not None else getattr(response, "status", None)
+
+
+def _response_size(response) -> int:
+    if not response:
+        return 0
+    body = getattr(response, "content", None) or getattr(response, "text", None) or b""
+    return len(body) if isinstance(body, (bytes, str)) else 0
+
+
+def _operation_name(query: str) -> Optional[str]:
+    match = _OPERATION_NAME.match(query)
+    return match.group(1) if match else None
+
+
+class CoStarClient:
+    """API client for CoStar GraphQL and REST endpoints.
+
+    Pass the session's shared `limiter` so every client on the same tab draws
+    from one token bucket; without it, `rate_limit` spaces requests per client.
+    With a `cache`, PDS details and named GraphQL queries that have a TTL are
+    served locally; `cache_bypass` forces a refetch while still refreshing it.
+    Shared `breakers` stop sending to an endpoint after repeated failures and
+    raise CircuitOpenError instead. A shared `metrics` object records latency,
+    status codes, retries and bytes per endpoint. A `cassette` records every
+    exchange to disk, or replays a recording in place of the tab. A
+    `transport` (HttpTransport) sends requests directly with the session's
+    cookies instead of through the tab's DevTools channel. While `ready`
+    (the session's re-auth event) is clear, requests wait instead of failing.
+    """
+
+    def __init__(
+        self,
+        tab,
+        rate_limit: float = 0.2,
+        limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+        cache_bypass: bool = False,
+        breakers: Optional[CircuitBreakers] = None,
+        metrics: Optional[ClientMetrics] = None,
+        cassette: Optional["Cassette"] = None,
+        transport: Optional[HttpTransport] = None,
+        ready: Optional[asyncio.Event] = None,
+    ):
+        sender = transport or tab
+        self.tab = cassette.wrap(sender) if cassette else sender
+        self.transport = transport
+        self.ready = ready
+        self.cassette = cassette
         self.rate_limit = rate_limit
+        self.limiter = limiter
+        self.cache = cache
+        self.cache_bypass = cache_bypass
+        self.breakers = breakers
+        self.metrics = metrics
         self.last_request: Optional[datetime] = None
         self.request_count = 0
+        self._listeners: List[Callable[[str, Optional[int], float], None]] = []
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def add_listener(self, listener: Callable[[str, Optional[int], float], None]):
+        """Register a callback invoked as listener(endpoint, status, latency) per HTTP attempt.
+
+        `status` is None when no response came back (timeout, transport error).
+        """
+        self._listeners.append(listener)
+
+    async def _send(self, endpoint: str, method: str, url: str, json: Optional[Dict] = None):
+        """Issue one request through the tab (or transport), timing it and notifying listeners."""
+        if self.ready and not self.ready.is_set():
+            logger.debug(f"Holding {endpoint} request until the session re-authenticates")
+            await self.ready.wait()
+
+        if self.breakers:
+            self.breakers.check(endpoint)
+
+        started = time.monotonic()
+        try:
+            if method == "get":
+                response = await self.tab.request.get(url, timeout=REQUEST_TIMEOUT)
+            else:
+                response = await self.tab.request.post(url, json=json, timeout=REQUEST_TIMEOUT)
+        except asyncio.CancelledError:
+            # The caller gave up on the request; that says nothing about the endpoint
+            if self.breakers:
+                self.breakers.abandon(endpoint)
+            raise
+        except BaseException:
+            self._observe(endpoint, None, time.monotonic() - started)
+            raise
+
+        self._observe(endpoint, response, time.monotonic() - started)
+        return response
+
+    def _observe(self, endpoint: str, response, latency: float):
+        """Feed one answered (or failed) request to breakers, metrics and listeners."""
+        status = response_status(response)
+        if self.breakers:
+            # A missing property is an answer, not an endpoint failure
+            ok = bool(response) and (response.ok or status == 404)
+            self.breakers.record(endpoint, status, ok)
+        if self.metrics:
+            self.metrics.observe(endpoint, status, latency, _response_size(response))
+        for listener in self._listeners:
+            try:
+                listener(endpoint, status, latency)
+            except Exception as e:
+                logger.debug(f"Request listener failed: {e}")
+
+    async def _enforce_rate_limit(self, endpoint: str = "graphql"):
+        if self.limiter:
+            started = time.monotonic()
+            await self.limiter.acquire(endpoint)
+            if self.metrics:
+                self.metrics.waited(endpoint, time.monotonic() - started)
+            self.last_request = datetime.now()
+            return
 
-    async def _enforce_rate_limit(self):
         if self.last_request:
             elapsed = (datetime.now() - self.last_request).total_seconds()
             if elapsed < self.rate_limit:
@@ -39,7 +181,77 @@ class CoStarClient:
         variables: Dict[str, Any],
         operation_name: Optional[str] = None
     ) -> Dict:
-        """Execute GraphQL query with retries."""
+        """Execute GraphQL query with retries, served from cache when possible.
+
+        Concurrent identical requests for a cacheable operation share one
+        in-flight call, e.g. two properties on the same parcel asking for its
+        Parcel_Info at once.
+        """
+        endpoint = operation_name or _operation_name(query)
+        cached = self.cached_response(endpoint, variables)
+        if cached is not None:
+            return cached
+
+        key = cache_key(endpoint, variables) if self._shareable(endpoint) else None
+        shared = self._inflight.get(key) if key else None
+        if shared:
+            try:
+                return await asyncio.shield(shared)
+            except asyncio.CancelledError:
+                if not shared.cancelled():
+                    raise
+                # The caller we were piggybacking on was cancelled; fetch it ourselves
+
+        future = asyncio.get_running_loop().create_future() if key else None
+        if future:
+            self._inflight[key] = future
+        try:
+            body = await self._post_graphql(query, variables, operation_name, allow_partial=False)
+            data = body.get("data") or {}
+            self.store_response(endpoint, variables, data)
+            if future:
+                future.set_result(data)
+            return data
+        except asyncio.CancelledError:
+            if future:
+                future.cancel()
+            raise
+        except Exception as e:
+            if future:
+                future.set_exception(e)
+                future.exception()  # Waiters re-raise it; don't warn when there are none
+            raise
+        finally:
+            if future and self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _shareable(self, endpoint: Optional[str]) -> bool:
+        """Operations worth coalescing: the ones the response cache would keep."""
+        if not endpoint:
+            return False
+        return bool(self.cache.ttl_for(endpoint) if self.cache else DEFAULT_TTLS.get(endpoint))
+
+    async def graphql_partial(
+        self,
+        query: str,
+        variables: Dict[str, Any],
+        operation_name: Optional[str] = None
+    ) -> Tuple[Dict, List[Dict]]:
+        """Execute GraphQL query, returning (data, errors) on partial failure.
+
+        Used for aliased batch documents, where one alias erroring should not
+        discard the other aliases' data. Raises only if no data came back.
+        """
+        body = await self._post_graphql(query, variables, operation_name, allow_partial=True)
+        return body.get("data") or {}, body.get("errors") or []
+
+    async def _post_graphql(
+        self,
+        query: str,
+        variables: Dict[str, Any],
+        operation_name: Optional[str],
+        allow_partial: bool
+    ) -> Dict:
         payload = {
             "operationName": operation_name,
             "variables": variables,
@@ -50,27 +262,27 @@ class CoStarClient:
             try:
                 await self._enforce_rate_limit()
 
-                response = await self.tab.request.post(
-                    GRAPHQL_URL,
-                    json=payload,
-                    timeout=REQUEST_TIMEOUT
-                )
+                response = await self._send("graphql", "post", GRAPHQL_URL, json=payload)
 
                 if not response or not response.ok:
-                    raise Exception(f"HTTP {getattr(response, 'status', 'No response')}")
+                    raise Exception(f"HTTP {response_status(response) or 'No response'}")
 
                 data = response.json()
 
-                if "errors" in data:
+                if "errors" in data and not (allow_partial and data.get("data")):
                     errors = [e.get("message", str(e)) for e in data["errors"]]
                     raise Exception(f"GraphQL errors: {errors}")
 
                 self.request_count += 1
-                return data.get("data", {})
+                return data
 
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 if attempt < MAX_RETRIES - 1:
                     wait = RETRY_DELAY * (2 ** attempt)
+                    if self.metrics:
+                        self.metrics.retry("graphql", wait)
                     logger.warning(f"Request failed, retry in {wait}s: {e}")
                     await asyncio.sleep(wait)
                 else:
@@ -78,93 +290,251 @@ class CoStarClient:
 
         raise Exception("Max retries exceeded")
 
+    def cached_response(self, endpoint: Optional[str], variables: Dict[str, Any]) -> Optional[Any]:
+        """Look up a cached response; None when uncached, expired or bypassed."""
+        if not self.cache or not endpoint or self.cache_bypass:
+            return None
+        return self.cache.get(endpoint, variables)
+
+    def store_response(self, endpoint: Optional[str], variables: Dict[str, Any], value: Any):
+        if self.cache and endpoint:
+            self.cache.set(endpoint, variables, value)
+
     async def search_properties(
         self,
         payload: Dict,
         max_pages: int = 10,
-        page_delay: float = 0.5
+        page_delay: float = 0.5,
+        concurrent: bool = False,
+        max_rows: Optional[int] = None
     ) -> List[Dict]:
-        """Search properties with automatic pagination."""
-        all_pins = []
+        """Search properties with automatic pagination.
 
-        for page in range(1, max_pages + 1):
-            page_payload = payload.copy()
-            page_payload["2"] = page
-
-            await self._enforce_rate_limit()
+        With `concurrent=True` the count endpoint sizes the result first and
+        the pages are fetched at once under the rate limiter, in page order
+        (see `iter_search_pages_concurrently`).
+        `max_rows` caps the result; no page beyond it is requested.
+        """
+        if max_rows:
+            max_pages = min(max_pages, math.ceil(max_rows / PAGE_SIZE))
 
-            try:
-                response = await self.tab.request.post(
-                    PROPERTY_SEARCH_URL,
-                    json=page_payload,
-                    timeout=REQUEST_TIMEOUT
-                )
+        if concurrent:
+            pages = self.iter_search_pages_concurrently(payload, max_pages, max_rows)
+        else:
+            pages = self.iter_search_pages(payload, max_pages, page_delay, max_rows)
 
-                if not response or not response.ok:
-                    if page == 1:
-                        logger.error(f"Property search failed: status={getattr(response, 'status', 'No response')}")
-                        return []
+        all_pins = []
+        try:
+            async for properties in pages:
+                all_pins.extend(properties)
+                if max_rows and len(all_pins) >= max_rows:
+                    all_pins = all_pins[:max_rows]
                     break
+        finally:
+            await pages.aclose()
 
-                data = response.json()
+        logger.info(f"Total: {len(all_pins)} properties")
+        return all_pins
 
-                # The API returns rich property data in the "properties" array
-                # and minimal pin data in "searchResult.Pins". Use "properties" for full data.
-                properties = data.get("properties", [])
+    async def iter_search_pages(
+        self,
+        payload: Dict,
+        max_pages: int = 10,
+        page_delay: float = 0.5,
+        max_rows: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """Yield each search page as soon as it arrives.
+
+        The next page is requested before the current one is yielded, so
+        callers processing a page overlap with pagination while holding at
+        most two pages in memory. Stops on a short page or a failed request.
+
+        `max_rows` is how many rows the caller expects to need: once the pages
+        so far cover it, the next page is no longer prefetched and is only
+        requested if the caller keeps iterating (e.g. it skipped some rows).
+        """
+        pending = asyncio.ensure_future(self._fetch_search_page(payload, 1))
+        page = 1
+        rows = 0
 
-                # Fallback to pins if properties not present
-                if not properties:
-                    if "searchResult" in data:
-                        sr = data.get("searchResult", {})
-                        properties = sr.get("Pins", []) or sr.get("pins", [])
-                    elif "Pins" in data:
-                        properties = data.get("Pins", [])
-                    elif "pins" in data:
-                        properties = data.get("pins", [])
-                    elif isinstance(data, list):
-                        properties = data
+        try:
+            while pending:
+                try:
+                    properties = await pending
+                except CircuitOpenError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Page {page} failed: {e}")
+                    return
+                pending = None
 
                 if not properties:
-                    break
-
-                # DEBUG: Log first property structure on first page
-                if page == 1 and properties:
-                    first_prop = properties[0]
-                    logger.info(f"DEBUG: First property has {len(first_prop)} keys: {list(first_prop.keys())[:20]}...")
-                    logger.info(f"DEBUG: First property - PropertyId={first_prop.get('PropertyId')}, City={first_prop.get('City')}, StateCode={first_prop.get('StateCode')}")
-                    logger.info(f"DEBUG: First property - TrueOwner={first_prop.get('TrueOwner')}")
-                    logger.info(f"DEBUG: First property - BuildingClass={first_prop.get('BuildingClass')}, YearBuilt={first_prop.get('YearBuilt')}")
+                    return
 
-                all_pins.extend(properties)
                 logger.info(f"Page {page}: {len(properties)} properties")
+                rows += len(properties)
 
-                if len(properties) < 2000:
-                    break
+                has_more = len(properties) >= PAGE_SIZE and page < max_pages
+                if has_more and not (max_rows and rows >= max_rows):
+                    pending = asyncio.ensure_future(self._fetch_search_page(payload, page + 1, delay=page_delay))
 
-                await asyncio.sleep(page_delay)
+                yield properties
 
-            except Exception as e:
-                logger.error(f"Page {page} failed: {e}")
-                if page == 1:
-                    return []
+                if has_more and not pending:
+                    # Budget was covered but the caller still wants rows: fetch on demand
+                    pending = asyncio.ensure_future(self._fetch_search_page(payload, page + 1, delay=page_delay))
+                page += 1
+        finally:
+            if pending and not pending.done():
+                pending.cancel()
+
+    async def iter_properties(
+        self,
+        payload: Dict,
+        max_pages: int = 10,
+        page_delay: float = 0.5
+    ) -> AsyncIterator[Dict]:
+        """Yield search results one property at a time, page by page."""
+        pages = self.iter_search_pages(payload, max_pages, page_delay)
+        try:
+            async for properties in pages:
+                for prop in properties:
+                    yield prop
+        finally:
+            await pages.aclose()
+
+    async def _count_pages(self, payload: Dict, max_pages: int) -> Optional[int]:
+        """Number of list-properties pages needed for a payload, capped at max_pages."""
+        counts = await self.count_properties(payload)
+        total = counts.get("PropertyCount")
+        if counts.get("error") or total is None:
+            logger.warning("Count unavailable, falling back to sequential pagination")
+            return None
+
+        pages = max(1, math.ceil(total / PAGE_SIZE))
+        if pages > max_pages:
+            logger.warning(f"{total} properties need {pages} pages, capped at {max_pages}")
+        return min(pages, max_pages)
+
+    async def iter_search_pages_concurrently(
+        self,
+        payload: Dict,
+        max_pages: int = 10,
+        max_rows: Optional[int] = None
+    ) -> AsyncIterator[List[Dict]]:
+        """Yield search pages in order, fetching them in concurrent batches.
+
+        The count endpoint sizes the search first. The first batch covers
+        `max_rows` (every page without it); the next batch of the same size
+        is only fetched if the caller keeps iterating, e.g. because it skipped
+        rows it had already processed. Failed pages are retried; if any still
+        fail, IncompleteSearchError is raised rather than leaving a hole.
+        Without a count this falls back to `iter_search_pages`.
+        """
+        total_pages = await self._count_pages(payload, max_pages)
+        if not total_pages:
+            pages = self.iter_search_pages(payload, max_pages, max_rows=max_rows)
+            try:
+                async for properties in pages:
+                    yield properties
+            finally:
+                await pages.aclose()
+            return
+
+        batch = min(total_pages, math.ceil(max_rows / PAGE_SIZE)) if max_rows else total_pages
+        first = 1
+        while first <= total_pages:
+            pages = list(range(first, min(first + batch, total_pages + 1)))
+            by_page = await self._fetch_pages_concurrently(payload, pages, total_pages)
+            for page in pages:
+                logger.info(f"Page {page}: {len(by_page[page])} properties")
+                yield by_page[page]
+                if len(by_page[page]) < PAGE_SIZE:
+                    return
+            first = pages[-1] + 1
+
+    async def _fetch_pages_concurrently(self, payload: Dict, pages: List[int], total_pages: int) -> Dict[int, List[Dict]]:
+        """Fetch `pages` at once, retrying failures; returns rows by page number."""
+        logger.info(f"Fetching pages {pages[0]}-{pages[-1]} of {total_pages} concurrently")
+        results = await asyncio.gather(
+            *[self._fetch_search_page(payload, page) for page in pages],
+            return_exceptions=True,
+        )
+        by_page = dict(zip(pages, results))
+
+        for attempt in range(1, PAGE_RETRIES + 1):
+            failed = [page for page, properties in by_page.items() if not isinstance(properties, list)]
+            if not failed:
                 break
+            for page in failed:
+                error = by_page[page]
+                if isinstance(error, CircuitOpenError):
+                    raise error
+                logger.warning(f"Page {page} failed ({error or 'bad status'}), retry {attempt}/{PAGE_RETRIES}")
+            retried = await asyncio.gather(
+                *[self._fetch_search_page(payload, page, delay=RETRY_DELAY * attempt) for page in failed],
+                return_exceptions=True,
+            )
+            by_page.update(zip(failed, retried))
 
-        logger.info(f"Total: {len(all_pins)} properties")
-        return all_pins
+        failed = [page for page, properties in by_page.items() if not isinstance(properties, list)]
+        if failed:
+            raise IncompleteSearchError(failed, total_pages)
+        return by_page
+
+    async def _fetch_search_page(self, payload: Dict, page: int, delay: float = 0) -> Optional[List[Dict]]:
+        """Fetch one list-properties page. Returns None on a failed response."""
+        if delay:
+            await asyncio.sleep(delay)
+
+        page_payload = payload.copy()
+        page_payload["2"] = page
+
+        await self._enforce_rate_limit("search")
+
+        response = await self._send("search", "post", PROPERTY_SEARCH_URL, json=page_payload)
+
+        if not response or not response.ok:
+            logger.error(f"Property search page {page} failed: status={response_status(response) or 'No response'}")
+            return None
+
+        data = response.json()
+
+        # The API returns rich property data in the "properties" array
+        # and minimal pin data in "searchResult.Pins". Use "properties" for full data.
+        properties = data.get("properties", []) if isinstance(data, dict) else []
+
+        # Fallback to pins if properties not present
+        if not properties:
+            if isinstance(data, list):
+                properties = data
+            elif "searchResult" in data:
+                sr = data.get("searchResult", {})
+                properties = sr.get("Pins", []) or sr.get("pins", [])
+            elif "Pins" in data:
+                properties = data.get("Pins", [])
+            elif "pins" in data:
+                properties = data.get("pins", [])
+
+        # DEBUG: Log first property structure on first page
+        if page == 1 and properties:
+            first_prop = properties[0]
+            logger.info(f"DEBUG: First property has {len(first_prop)} keys: {list(first_prop.keys())[:20]}...")
+            logger.info(f"DEBUG: First property - PropertyId={first_prop.get('PropertyId')}, City={first_prop.get('City')}, StateCode={first_prop.get('StateCode')}")
+            logger.info(f"DEBUG: First property - TrueOwner={first_prop.get('TrueOwner')}")
+            logger.info(f"DEBUG: First property - BuildingClass={first_prop.get('BuildingClass')}, YearBuilt={first_prop.get('YearBuilt')}")
+
+        return properties
 
     async def count_properties(self, payload: Dict) -> Dict:
         """Get property counts for a search payload without fetching all data."""
-        await self._enforce_rate_limit()
+        await self._enforce_rate_limit("count")
 
         try:
-            response = await self.tab.request.post(
-                PROPERTY_COUNT_URL,
-                json=payload,
-                timeout=REQUEST_TIMEOUT
-            )
+            response = await self._send("count", "post", PROPERTY_COUNT_URL, json=payload)
 
             if not response or not response.ok:
-                logger.error(f"Property count failed: status={getattr(response, 'status', 'No response')}")
+                logger.error(f"Property count failed: status={response_status(response) or 'No response'}")
                 return {"error": "Count request failed"}
 
             data = response.json()
@@ -185,15 +555,19 @@ class CoStarClient:
         - Sale: last sale price/date, cap rate
         - Amenities, expenses, etc.
         """
+        cached = self.cached_response("pds", {"propertyId": property_id})
+        if cached is not None:
+            return cached
+
         for attempt in range(MAX_RETRIES):
             try:
-                await self._enforce_rate_limit()
+                await self._enforce_rate_limit("pds")
 
                 url = f"{PROPERTY_DETAILS_URL}/{property_id}"
-                response = await self.tab.request.get(url, timeout=REQUEST_TIMEOUT)
+                response = await self._send("pds", "get", url)
 
                 if not response or not response.ok:
-                    status = getattr(response, 'status', 'No response')
+                    status = response_status(response) or 'No response'
                     if status == 404:
                         logger.warning(f"Property {property_id} not found")
                         return {"error": "not_found"}
@@ -201,11 +575,16 @@ class CoStarClient:
 
                 data = response.json()
                 self.request_count += 1
+                self.store_response("pds", {"propertyId": property_id}, data)
                 return data
 
+            except CircuitOpenError:
+                raise
             except Exception as e:
                 if attempt < MAX_RETRIES - 1:
                     wait = RETRY_DELAY * (2 ** attempt)
+                    if self.metrics:
+                        self.metrics.retry("pds", wait)
                     logger.warning(f"Property details request failed, retry in {wait}s: {e}")
                     await asyncio.sleep(wait)
                 else:
@@ -0,0 +1,105 @@
+"""CoStar Dead Letters - Persistent list of property extractions that failed."""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DEAD_LETTER_PATH = Path("session") / "costar_dead_letters.sqlite"
+
+
+class DeadLetterQueue:
+    """Failed properties, kept with enough context to retry them later.
+
+    One row per property ID: repeat failures bump `attempts` and keep the
+    latest error. Entries are removed by `resolve` once a retry succeeds.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DEAD_LETTER_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS dead_letters (
+                property_id INTEGER PRIMARY KEY,
+                error TEXT,
+                market_ids TEXT,
+                search_result TEXT,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                first_failed_at TEXT NOT NULL,
+                last_failed_at TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def record(
+        self,
+        property_id: int,
+        error: str,
+        market_ids: Optional[List[int]] = None,
+        search_result: Optional[Dict] = None,
+    ):
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO dead_letters
+                    (property_id, error, market_ids, search_result, first_failed_at, last_failed_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(property_id) DO UPDATE SET
+                    error = excluded.error,
+                    attempts = attempts + 1,
+                    last_failed_at = excluded.last_failed_at
+                """,
+                (
+                    property_id,
+                    error,
+                    json.dumps(market_ids or []),
+                    json.dumps(search_result or {}, default=str),
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+
+    def pending(self, limit: Optional[int] = None) -> List[Dict]:
+        """Failed properties, oldest first."""
+        query = "SELECT property_id, error, market_ids, search_result, attempts, last_failed_at " \
+                "FROM dead_letters ORDER BY first_failed_at"
+        params: tuple = ()
+        if limit:
+            query += " LIMIT ?"
+            params = (limit,)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            {
+                "property_id": row[0],
+                "error": row[1],
+                "market_ids": json.loads(row[2] or "[]"),
+                "search_result": json.loads(row[3] or "{}"),
+                "attempts": row[4],
+                "last_failed_at": row[5],
+            }
+            for row in rows
+        ]
+
+    def resolve(self, property_id: int):
+        with self._lock:
+            self._conn.execute("DELETE FROM dead_letters WHERE property_id = ?", (property_id,))
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM dead_letters").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,52 @@
+"""CoStar Property Dedupe - Skip properties already claimed by an earlier payload."""
+
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class PropertyIndex:
+    """Property IDs seen in a run, with every payload that matched each one.
+
+    The first payload to `claim` a property extracts it; later payloads that
+    match the same property only add themselves to its attribution, so no
+    contacts or parcel request is ever made twice. Share one index between
+    extractors (e.g. across find_sellers_batch queries) to dedupe across them.
+    """
+
+    def __init__(self):
+        self._matches: Dict[int, List[str]] = {}
+        self.duplicates = 0
+
+    def claim(self, property_id: int, source: str) -> bool:
+        """Record that `source` matched the property; True only the first time it is seen."""
+        matches = self._matches.get(property_id)
+        if matches is None:
+            self._matches[property_id] = [source]
+            return True
+
+        if source not in matches:
+            matches.append(source)
+        self.duplicates += 1
+        return False
+
+    def matches(self, property_id: int) -> List[str]:
+        return list(self._matches.get(property_id, []))
+
+    def attribution(self, min_sources: int = 2) -> Dict[int, List[str]]:
+        """Properties matched by at least `min_sources` payloads."""
+        return {pid: list(sources) for pid, sources in self._matches.items() if len(sources) >= min_sources}
+
+    def __contains__(self, property_id: int) -> bool:
+        return property_id in self._matches
+
+    def __len__(self) -> int:
+        return len(self._matches)
+
+    def stats(self) -> Dict:
+        return {
+            "properties": len(self._matches),
+            "duplicates_skipped": self.duplicates,
+            "multi_matched": sum(1 for sources in self._matches.values() if len(sources) > 1),
+        }
@@ -3,15 +3,23 @@
 import asyncio
 import logging
 import random
-from typing import Any, Dict, List, Optional
-
-from .client import CoStarClient
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .adaptive import DEFAULT_MAX, AdaptiveConcurrency
+from .cache import cache_key
+from .checkpoint import CHECKPOINT_EVERY, COMPLETE, RUNNING, CheckpointStore
+from .circuit import CircuitOpenError
+from .client import PAGE_SIZE, CoStarClient
+from .deadletter import DeadLetterQueue
+from .dedupe import PropertyIndex
+from .partition import PayloadPartitioner
 
 logger = logging.getLogger(__name__)
 
-CONTACTS_QUERY = """
-query ContactsDetail($propertyId: Int!) {
-  propertyDetail {
+NO_CONTACTS_DAYS = 30.0  # Suggested window when skipping known-empty properties is switched on
+
+CONTACTS_SELECTION = """
     propertyDetailHeader(propertyId: $propertyId) {
       propertyId
       addressHeader
@@ -34,11 +42,39 @@ query ContactsDetail($propertyId: Int!) {
           phoneNumbers
         }
       }
-    }
+    }"""
+
+CONTACTS_QUERY = """
+query ContactsDetail($propertyId: Int!) {
+  propertyDetail {""" + CONTACTS_SELECTION + """
   }
 }
 """
 
+MAX_BATCH_SIZE = 25  # Properties per aliased ContactsDetail document
+
+
+def build_contacts_batch_query(property_ids: List[int]) -> Tuple[str, Dict[str, int]]:
+    """Pack several properties into one ContactsDetail document using aliases.
+
+    Each property gets its own `p<id>: propertyDetail { ... }` field and
+    `$p<id>` variable, so the response can be split back per property.
+    """
+    params = []
+    fields = []
+    variables = {}
+
+    for property_id in dict.fromkeys(property_ids):
+        alias = f"p{property_id}"
+        params.append(f"${alias}: Int!")
+        selection = CONTACTS_SELECTION.replace("$propertyId", f"${alias}")
+        fields.append(f"  {alias}: propertyDetail {{{selection}\n  }}")
+        variables[alias] = property_id
+
+    query = f"query ContactsDetailBatch({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}\n"
+    return query, variables
+
+
 PARCEL_PINS_QUERY = """
 query parcelPinsFromProperty($propertyId: Int!) {
   parcelPinsFromProperty(propertyId: $propertyId) {
@@ -90,6 +126,20 @@ class ContactExtractor:
         max_delay: float = 0.4,  # Max delay between requests
         burst_size: int = 150,  # Properties before taking a break
         burst_delay: float = 3.0,  # Seconds to pause between bursts
+        batch_size: int = 1,  # Properties per contacts request (1 = no batching)
+        concurrent_pages: bool = False,  # Size search via count, fetch pages in parallel
+        partition: bool = False,  # Split payloads that exceed the search result cap
+        adaptive: bool = False,  # Let AIMD tune concurrency from response health
+        max_concurrency: int = DEFAULT_MAX,  # Ceiling for adaptive concurrency
+        dead_letters: Optional[DeadLetterQueue] = None,  # Where failed properties are kept
+        circuit_wait: float = 600.0,  # Max seconds a property waits on an open circuit
+        checkpoint: Optional[CheckpointStore] = None,  # Where run progress is persisted
+        checkpoint_every: int = CHECKPOINT_EVERY,  # Properties between checkpoint writes
+        run_id: Optional[str] = None,  # ID for a new checkpointed run (generated if omitted)
+        resume: Optional[str] = None,  # Run ID to resume; its finished properties are skipped
+        property_index: Optional[PropertyIndex] = None,  # Share to dedupe properties across extractors
+        source: Optional[str] = None,  # Label for payload attribution, e.g. the query name
+        no_contacts_days: Optional[float] = None,  # Skip properties empty this many days ago (None = off)
     ):
         self.client = client
         self.require_email = require_email
@@ -101,9 +151,33 @@ class ContactExtractor:
         self.max_delay = max_delay
         self.burst_size = burst_size
         self.burst_delay = burst_delay
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.concurrent_pages = concurrent_pages
+        self.partition = partition
+        self.controller: Optional[AdaptiveConcurrency] = None
+        if adaptive:
+            self.controller = AdaptiveConcurrency(initial=concurrency, maximum=max_concurrency)
+            client.add_listener(self.controller.record)
+        self.dead_letters = dead_letters
+        self.circuit_wait = circuit_wait
+        self.checkpoint = checkpoint
+        self.checkpoint_every = checkpoint_every
+        self.resume = resume
+        self.run_id: Optional[str] = run_id
+        self.property_index = property_index if property_index is not None else PropertyIndex()
+        self.source = source
+        self.failed_properties: set = set()
+        self.owner_hits = 0  # Contacts queries skipped thanks to a known owner roster
+        self.no_contacts_days = no_contacts_days
+        self.no_contacts_skipped = 0
+        self._owner_rosters: Dict[str, Dict] = {}
+        self.paused = False
         self._seen_emails: set = set()
         self._semaphore: Optional[asyncio.Semaphore] = None
+        self._running: Optional[asyncio.Event] = None  # Cleared during burst pauses
         self._properties_since_burst: int = 0
+        self._properties_processed: int = 0
+        self._total_pins: int = 0
 
     async def extract_from_payloads(
         self,
@@ -112,108 +186,490 @@ class ContactExtractor:
     ) -> List[Dict]:
         """Extract contacts from multiple search payloads, deduplicated by email.
 
-        Safe for large extractions (10k+) with:
-        - Conservative concurrency (3 parallel requests)
-        - Burst pauses every 50 properties
-        - Variable delays between requests
-        - Progress logging every 100 properties
+        Collects `iter_contacts` into a list; use `iter_contacts` directly to
+        handle contacts as they arrive without holding the whole run in memory.
+        """
+        return [contact async for contact in self.iter_contacts(payloads, max_properties)]
+
+    async def iter_contacts(
+        self,
+        payloads: List[Dict],
+        max_properties: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """Yield contacts, deduplicated by email, as each property completes.
+
+        Runs as a pipeline: a producer streams search pages into a bounded
+        queue, long-lived workers (one per concurrency slot) pull properties
+        off it, and this generator consumes their results. A slow property
+        only holds up its own worker, so the other slots stay busy. Progress
+        logging, burst pauses and `max_properties` are handled centrally, and
+        a slow caller applies backpressure through the bounded result queue.
+        A property matched by several payloads is fetched once; the others are
+        only recorded in `property_index` for attribution. Properties that had
+        no usable contacts within `no_contacts_days` (same email/phone filters)
+        are skipped without a request and don't count towards `max_properties`.
+
+        With a `checkpoint` store, progress is saved every `checkpoint_every`
+        properties under `self.run_id`. Resuming a run skips its finished
+        properties and the emails it already emitted, so only new contacts
+        are yielded; properties that failed last time are tried again.
         """
-        all_contacts = []
-        properties_processed = 0
-        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._semaphore = self.controller or asyncio.Semaphore(self.concurrency)
         self._properties_since_burst = 0
+        self._properties_processed = 0
+        self._total_pins = 0
+        self._running = asyncio.Event()
+        self._running.set()
+        contacts_found = 0
+        completed = self._open_checkpoint(payloads)
+        unsaved_done: List[int] = []
+        unsaved_failed: List[int] = []
+        unsaved_emails: List[str] = []
+
+        # The adaptive controller gates in-flight requests, so give it enough workers to grow into
+        workers = self.controller.maximum if self.controller else self.concurrency
+        work: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        results: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+
+        worker_tasks = [asyncio.create_task(self._worker(work, results)) for _ in range(workers)]
+
+        async def feed():
+            try:
+                await self._produce(payloads, work, max_properties, completed)
+                for _ in worker_tasks:
+                    await work.put(None)
+                await asyncio.gather(*worker_tasks)
+            finally:
+                await results.put(None)
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                item = await results.get()
+                if item is None:
+                    break
+
+                property_ids, contacts = item
+                count = len(property_ids)
+                before = self._properties_processed
+                self._properties_processed += count
+                self._properties_since_burst += count
+                contacts_found += len(contacts)
+
+                for contact in contacts:
+                    yield contact
+
+                # Only after delivery, so an interrupted run redoes rather than loses a property
+                if self.checkpoint:
+                    for property_id in property_ids:
+                        (unsaved_failed if property_id in self.failed_properties else unsaved_done).append(property_id)
+                    unsaved_emails.extend(c["email"].lower() for c in contacts if c.get("email"))
+                    if self._properties_processed // self.checkpoint_every > before // self.checkpoint_every:
+                        self._save_checkpoint(unsaved_done, unsaved_failed, unsaved_emails)
+
+                # Progress logging every 100 properties
+                if self._properties_processed // 100 > before // 100:
+                    logger.info(
+                        f"Progress: {self._properties_processed}/{self._total_pins} properties, "
+                        f"{contacts_found} contacts"
+                    )
+
+                # Burst pause for safety - take a break every N properties
+                if self._properties_since_burst >= self.burst_size:
+                    pause = self.burst_delay + random.uniform(0, 2)  # Add randomness
+                    logger.info(f"Burst pause: {pause:.1f}s after {self._properties_since_burst} properties")
+                    self._running.clear()
+                    await asyncio.sleep(pause)
+                    self._running.set()
+                    self._properties_since_burst = 0
+
+            # Surface producer errors (the search itself failing)
+            await feeder
+            if self.checkpoint:
+                self._save_checkpoint(unsaved_done, unsaved_failed, unsaved_emails, COMPLETE)
+        finally:
+            for task in worker_tasks + [feeder]:
+                task.cancel()
+            if self.checkpoint and (unsaved_done or unsaved_failed or unsaved_emails):
+                # Interrupted: keep whatever finished since the last checkpoint
+                self._save_checkpoint(unsaved_done, unsaved_failed, unsaved_emails)
+
+        if self.failed_properties:
+            logger.warning(f"{len(self.failed_properties)} properties failed" + (" (dead-lettered)" if self.dead_letters else ""))
+        if self.no_contacts_skipped:
+            logger.info(f"Skipped {self.no_contacts_skipped} properties with no usable contacts in the last {self.no_contacts_days:g} days")
+        logger.info(f"Extraction complete: {self._properties_processed} properties, {contacts_found} unique contacts")
+
+    def _open_checkpoint(self, payloads: List[Dict]) -> set:
+        """Start or resume a checkpointed run; returns property IDs already finished."""
+        if not self.checkpoint:
+            return set()
+
+        payload_hash = cache_key("payloads", {"payloads": payloads})
+        if not self.resume:
+            self.run_id = self.checkpoint.start_run(payload_hash, self.run_id)
+            logger.info(f"Checkpointing as run {self.run_id}")
+            return set()
+
+        saved = self.checkpoint.load(self.resume)
+        if saved is None:
+            raise ValueError(f"No checkpoint found for run {self.resume}")
+        if saved.payload_hash != payload_hash:
+            raise ValueError(f"Run {self.resume} was started with different payloads")
+
+        self.run_id = saved.run_id
+        self._seen_emails |= saved.seen_emails
+        logger.info(
+            f"Resuming run {self.run_id}: skipping {len(saved.completed)} finished properties, "
+            f"retrying {len(saved.failed - saved.completed)} failed"
+        )
+        return saved.completed
+
+    def _save_checkpoint(self, done: List[int], failed: List[int], emails: List[str], status: str = RUNNING):
+        self.checkpoint.save(self.run_id, self._total_pins, done, failed, emails, status)
+        done.clear()
+        failed.clear()
+        emails.clear()
+
+    async def _produce(
+        self,
+        payloads: List[Dict],
+        work: asyncio.Queue,
+        max_properties: Optional[int] = None,
+        completed: Optional[set] = None
+    ):
+        """Stream pins from every payload onto the work queue, `batch_size` properties per item.
+
+        Properties in `completed` (finished by a resumed run) are skipped but
+        still count towards `max_properties`.
+        """
+        completed = completed or set()
+        queued = len(completed)
 
-        total_pins = 0
         for i, payload in enumerate(payloads):
             logger.info(f"Processing payload {i+1}/{len(payloads)}")
+            source = f"{self.source}#{i+1}" if self.source else f"payload#{i+1}"
+            duplicates_before = self.property_index.duplicates
 
             # Extract market_id from payload geography filter
             market_ids = self._extract_market_ids(payload)
 
-            pins = await self.client.search_properties(payload)
-            total_pins += len(pins)
-
-            # DEBUG: Log first pin structure to verify field names
-            if pins and i == 0:
-                first_pin = pins[0]
-                logger.info(f"DEBUG: First pin keys: {list(first_pin.keys())}")
-                logger.info(f"DEBUG: First pin City={first_pin.get('City')}, StateCode={first_pin.get('StateCode')}")
-                logger.info(f"DEBUG: First pin TrueOwner={first_pin.get('TrueOwner')}")
-                logger.info(f"DEBUG: include_parcel={self.include_parcel}")
-
-            # Apply max_properties limit across all payloads
-            if max_properties:
-                remaining = max_properties - properties_processed
-                if remaining <= 0:
-                    break
-                pins = pins[:remaining]
+            # Pages stream in while earlier pages are being extracted
+            pages = self._iter_pins(payload, max_rows=(max_properties - queued) if max_properties else None)
+            try:
+                async for pins in pages:
+                    self._total_pins += len(pins)
 
-            # Process properties in small batches for parallel execution
-            batch_size = self.concurrency * 2  # Process 2x concurrency at a time
-            for batch_start in range(0, len(pins), batch_size):
-                batch = pins[batch_start:batch_start + batch_size]
+                    # DEBUG: Log first pin structure to verify field names
+                    if pins and i == 0 and self._total_pins == len(pins):
+                        first_pin = pins[0]
+                        logger.info(f"DEBUG: First pin keys: {list(first_pin.keys())}")
+                        logger.info(f"DEBUG: First pin City={first_pin.get('City')}, StateCode={first_pin.get('StateCode')}")
+                        logger.info(f"DEBUG: First pin TrueOwner={first_pin.get('TrueOwner')}")
+                        logger.info(f"DEBUG: include_parcel={self.include_parcel}")
 
-                # Create tasks for parallel execution
-                tasks = []
-                for prop in batch:
                     # Handle both formats: PropertyId from properties array, or i from Pins
-                    property_id = prop.get("PropertyId") or prop.get("i")
-                    if property_id:
-                        # Pass full property data for rich extraction
-                        tasks.append(self._extract_property_contacts_with_evasion(property_id, market_ids, prop))
+                    items = [(prop.get("PropertyId") or prop.get("i"), prop) for prop in pins]
+                    items = [(property_id, prop) for property_id, prop in items if property_id and property_id not in completed]
+
+                    # Skip properties an earlier payload already claimed, and apply
+                    # max_properties across all payloads (only new properties count)
+                    fresh = []
+                    for property_id, prop in items:
+                        if max_properties and queued + len(fresh) >= max_properties:
+                            break
+                        if self.property_index.claim(property_id, source) and not self._known_no_contacts(property_id):
+                            fresh.append((property_id, prop))
+                    items = fresh
+
+                    for start in range(0, len(items), self.batch_size):
+                        chunk = items[start:start + self.batch_size]
+                        await work.put((chunk, market_ids))
+                        queued += len(chunk)
+
+                    if max_properties and queued >= max_properties:
+                        break
+            except CircuitOpenError as e:
+                # Keep what we have; the remaining pages of this payload are lost
+                logger.error(f"Payload {i+1} search stopped: {e}")
+            finally:
+                await pages.aclose()
+
+            duplicates = self.property_index.duplicates - duplicates_before
+            if duplicates:
+                logger.info(f"Payload {i+1}: skipped {duplicates} properties already matched by an earlier payload")
+
+            if max_properties and queued >= max_properties:
+                break
+
+    async def _worker(self, work: asyncio.Queue, results: asyncio.Queue):
+        """Pull chunks of properties until the producer sends the stop marker (None)."""
+        while True:
+            item = await work.get()
+            if item is None:
+                return
+
+            # Burst pauses stop workers from starting new properties
+            await self._running.wait()
+
+            chunk, market_ids = item
+            try:
+                contacts = await self._process_chunk(chunk, market_ids)
+            except Exception as e:
+                # Dead-lettered, so the checkpoint records these as failed rather than done
+                logger.warning(f"Batch extraction error: {e}")
+                for property_id, prop in chunk:
+                    self._record_failure(property_id, e, market_ids, prop)
+                contacts = []
+            await results.put(([property_id for property_id, _ in chunk], contacts))
+
+    async def _iter_pins(self, payload: Dict, max_rows: Optional[int] = None) -> AsyncIterator[List[Dict]]:
+        """Yield search result pages for a payload.
+
+        `max_rows` is the remaining property budget: pages past it are only
+        fetched if the caller keeps asking (some rows were skipped), so a small
+        preview costs one search page instead of the full result.
+        """
+        if self.partition:
+            pages = PayloadPartitioner(self.client).iter_pages(payload, max_rows=max_rows)
+        elif self.concurrent_pages and not (max_rows and max_rows <= PAGE_SIZE):
+            pages = self.client.iter_search_pages_concurrently(payload, max_rows=max_rows)
+        else:
+            pages = self.client.iter_search_pages(payload, max_rows=max_rows)
 
-                # Execute batch in parallel with semaphore limiting
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            async for pins in pages:
+                yield pins
+        finally:
+            await pages.aclose()
+
+    async def _process_chunk(self, chunk: List[Tuple[int, Dict]], market_ids: List[int]) -> List[Dict]:
+        """Extract contacts for one work item (a single property, or one contacts batch)."""
+        # Properties whose owner roster we already hold need no contacts query
+        prefetched = {}
+        for property_id, prop in chunk:
+            owner_data = self._owner_contacts_data(property_id, prop)
+            if owner_data is not None:
+                prefetched[property_id] = owner_data
+
+        if self.batch_size > 1:
+            pending = [property_id for property_id, _ in chunk if property_id not in prefetched]
+            if pending:
+                prefetched.update(await self._prefetch_contacts(pending))
+
+        if len(chunk) == 1:
+            property_id, prop = chunk[0]
+            return await self._extract_property_contacts_with_evasion(
+                property_id, market_ids, prop, prefetched.get(property_id)
+            )
+
+        results = await asyncio.gather(*[
+            self._extract_property_contacts_with_evasion(property_id, market_ids, prop, prefetched.get(property_id))
+            for property_id, prop in chunk
+        ], return_exceptions=True)
+
+        contacts = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Batch extraction error: {result}")
+                continue
+            contacts.extend(result)
+        return contacts
 
-                for result in results:
-                    if isinstance(result, Exception):
-                        logger.warning(f"Batch extraction error: {result}")
-                        continue
-                    if result:
-                        all_contacts.extend(result)
+    @staticmethod
+    def _search_row_owner(search_result: Optional[Dict]) -> Dict:
+        """TrueOwner from a list-properties row (an array there, fields lowercase)."""
+        true_owner_list = (search_result or {}).get("TrueOwner") or []
+        if isinstance(true_owner_list, list):
+            return true_owner_list[0] if true_owner_list else {}
+        return true_owner_list if isinstance(true_owner_list, dict) else {}
+
+    def _owner_contacts_data(self, property_id: int, search_result: Optional[Dict]) -> Optional[Dict]:
+        """A contacts response built from the owner's cached roster, if we have it.
+
+        The roster is company-level, so any property with the same TrueOwner
+        gets the same contacts; only the GraphQL address header is lost, and
+        the search row's address is used instead.
+        """
+        owner_id = self._search_row_owner(search_result).get("id")
+        if not owner_id:
+            return None
 
-                properties_processed += len(batch)
-                self._properties_since_burst += len(batch)
+        key = str(owner_id)
+        roster = self._owner_rosters.get(key)
+        if roster is None:
+            roster = self.client.cached_response("owner_contacts", {"companyId": key})
+            if roster is None:
+                return None
+            self._owner_rosters[key] = roster
 
-                # Progress logging every 100 properties
-                if properties_processed % 100 == 0 and properties_processed > 0:
-                    logger.info(f"Progress: {properties_processed}/{total_pins} properties, {len(all_contacts)} contacts")
+        self.owner_hits += 1
+        return {
+            "propertyDetail": {
+                "propertyDetailHeader": {"propertyId": property_id, "addressHeader": (search_result or {}).get("Address")},
+                "propertyContactDetails_info": {"trueOwner": roster},
+            }
+        }
 
-                # Burst pause for safety - take a break every N properties
-                if self._properties_since_burst >= self.burst_size:
-                    pause = self.burst_delay + random.uniform(0, 2)  # Add randomness
-                    logger.info(f"Burst pause: {pause:.1f}s after {self._properties_since_burst} properties")
-                    await asyncio.sleep(pause)
-                    self._properties_since_burst = 0
+    def _remember_owner(self, true_owner: Dict, search_owner: Dict):
+        """Keep an owner's roster for this run and, via the response cache, later runs."""
+        keys = {str(k) for k in (true_owner.get("companyId"), search_owner.get("id")) if k}
+        for key in keys:
+            if key not in self._owner_rosters:
+                self._owner_rosters[key] = true_owner
+                self.client.store_response("owner_contacts", {"companyId": key}, true_owner)
+
+    async def _prefetch_contacts(self, property_ids: List[int]) -> Dict[int, Dict]:
+        """Fetch contacts for many properties using aliased batch documents.
+
+        Properties missing from the result (alias errored or whole batch
+        failed) fall back to a single ContactsDetail request later.
+        """
+        prefetched = {}
+        pending = []
+        for property_id in property_ids:
+            cached = self.client.cached_response("ContactsDetail", {"propertyId": property_id})
+            if cached is not None:
+                prefetched[property_id] = cached
+            else:
+                pending.append(property_id)
 
-        logger.info(f"Extraction complete: {properties_processed} properties, {len(all_contacts)} unique contacts")
-        return all_contacts
+        chunks = [
+            pending[i:i + self.batch_size]
+            for i in range(0, len(pending), self.batch_size)
+        ]
+        results = await asyncio.gather(*[self._fetch_contacts_batch(chunk) for chunk in chunks])
+
+        for result in results:
+            # Store per property so single and batched lookups share entries
+            for property_id, data in result.items():
+                self.client.store_response("ContactsDetail", {"propertyId": property_id}, data)
+            prefetched.update(result)
+        return prefetched
+
+    async def _fetch_contacts_batch(self, property_ids: List[int]) -> Dict[int, Dict]:
+        query, variables = build_contacts_batch_query(property_ids)
+
+        async with self._semaphore:
+            await asyncio.sleep(random.uniform(self.min_delay, self.max_delay))
+            try:
+                data, errors = await self.client.graphql_partial(query, variables, "ContactsDetailBatch")
+            except Exception as e:
+                logger.warning(f"Contacts batch of {len(property_ids)} failed, falling back to single requests: {e}")
+                return {}
+
+        failed_aliases = {
+            error["path"][0] for error in errors
+            if isinstance(error, dict) and error.get("path")
+        }
+        if failed_aliases:
+            logger.debug(f"Contacts batch: {len(failed_aliases)} alias(es) errored, retrying individually")
+
+        # Reshape each alias into the single-property response shape
+        return {
+            property_id: {"propertyDetail": data[alias]}
+            for alias, property_id in variables.items()
+            if alias not in failed_aliases and data.get(alias) is not None
+        }
 
     async def _extract_property_contacts_with_evasion(
         self,
         property_id: int,
         market_ids: Optional[List[int]] = None,
-        search_result: Optional[Dict] = None
+        search_result: Optional[Dict] = None,
+        contacts_data: Optional[Dict] = None
     ) -> List[Dict]:
-        """Wrapper that adds rate limiting and variable delays for evasion."""
-        async with self._semaphore:
-            # Variable delay before request (evasion)
-            delay = random.uniform(self.min_delay, self.max_delay)
-            await asyncio.sleep(delay)
+        """Wrapper that adds rate limiting and variable delays for evasion.
 
-            return await self._extract_property_contacts(property_id, market_ids, search_result)
+        While the client's circuit is open (CoStar failing or the session
+        expired) the property waits outside the concurrency slot and is
+        retried; after `circuit_wait` seconds it goes to the dead letters.
+        """
+        waited = 0.0
+        while True:
+            try:
+                # Contacts already fetched in a batch and no follow-up calls needed
+                if contacts_data is not None and not self.include_parcel:
+                    return await self._extract_property_contacts(property_id, market_ids, search_result, contacts_data)
+
+                async with self._semaphore:
+                    # Variable delay before request (evasion)
+                    delay = random.uniform(self.min_delay, self.max_delay)
+                    await asyncio.sleep(delay)
+
+                    return await self._extract_property_contacts(property_id, market_ids, search_result, contacts_data)
+
+            except CircuitOpenError as e:
+                if waited >= self.circuit_wait:
+                    self._record_failure(property_id, e, market_ids, search_result)
+                    return []
+                if not self.paused:
+                    logger.warning(f"Extraction paused: {e}")
+                self.paused = True
+                pause = max(e.retry_in, 1.0)
+                await asyncio.sleep(pause)
+                waited += pause
+            else:
+                self.paused = False
 
-    async def _extract_property_contacts(
+    def _record_failure(
         self,
         property_id: int,
+        error: Exception,
         market_ids: Optional[List[int]] = None,
         search_result: Optional[Dict] = None
+    ):
+        self.failed_properties.add(property_id)
+        if self.dead_letters:
+            self.dead_letters.record(property_id, str(error), market_ids, search_result)
+
+    async def retry_dead_letters(self, limit: Optional[int] = None) -> List[Dict]:
+        """Re-run failed properties from the dead letters, removing the ones that succeed."""
+        if not self.dead_letters:
+            return []
+
+        self._semaphore = self.controller or asyncio.Semaphore(self.concurrency)
+        entries = self.dead_letters.pending(limit)
+        logger.info(f"Retrying {len(entries)} dead-lettered properties")
+
+        async def retry(entry: Dict) -> List[Dict]:
+            property_id = entry["property_id"]
+            self.failed_properties.discard(property_id)
+            contacts = await self._extract_property_contacts_with_evasion(
+                property_id, entry["market_ids"], entry["search_result"]
+            )
+            if property_id not in self.failed_properties:
+                self.dead_letters.resolve(property_id)
+            return contacts
+
+        results = await asyncio.gather(*[retry(entry) for entry in entries])
+        contacts = [contact for result in results for contact in result]
+        logger.info(f"Dead letter retry: {len(contacts)} contacts, {self.dead_letters.count()} still failing")
+        return contacts
+
+    async def _extract_property_contacts(
+        self,
+        property_id: int,
+        market_ids: Optional[List[int]] = None,
+        search_result: Optional[Dict] = None,
+        contacts_data: Optional[Dict] = None
     ) -> List[Dict]:
+        # The parcel pin lookup only needs the property ID, so it runs alongside
+        # the contacts query and only parcel details wait for it. Properties that
+        # turn out to have no usable contacts cancel it (see `finally`); cancelled
+        # requests are not counted by breakers, AIMD or metrics (see _send)
+        parcel_id_task = None
+        if self.include_parcel and contacts_data is None:
+            parcel_id_task = asyncio.ensure_future(self._get_parcel_id(property_id))
+
         try:
             # DEBUG: Log what search_result we received
             logger.debug(f"Property {property_id}: search_result has {len(search_result) if search_result else 0} keys")
 
-            data = await self.client.graphql(CONTACTS_QUERY, {"propertyId": property_id})
+            if contacts_data is not None:
+                data = contacts_data
+            else:
+                data = await self.client.graphql(CONTACTS_QUERY, {"propertyId": property_id})
 
             prop_detail = data.get("propertyDetail", {})
             header = prop_detail.get("propertyDetailHeader", {})
@@ -227,14 +683,15 @@ class ContactExtractor:
                 true_owner = {}
 
             if not true_owner:
+                self._remember_no_contacts(property_id)
                 return []
 
             # Extract rich data from search result (list-properties response)
             sr = search_result or {}
 
             # TrueOwner is an array in the properties response
-            true_owner_list = sr.get("TrueOwner") or []
-            sr_true_owner = true_owner_list[0] if isinstance(true_owner_list, list) and true_owner_list else (true_owner_list if isinstance(true_owner_list, dict) else {})
+            sr_true_owner = self._search_row_owner(sr)
+            self._remember_owner(true_owner, sr_true_owner)
 
             # DEBUG: Log extracted values
             if sr:
@@ -244,7 +701,7 @@ class ContactExtractor:
             base = {
                 # Core identifiers - use function arg as fallback since GraphQL may not return it
                 "property_id": header.get("propertyId") or property_id,
-                "property_address": header.get("addressHeader"),
+                "property_address": header.get("addressHeader") or sr.get("Address"),
 
                 # From search result - comprehensive property data
                 "property_type": sr.get("PropertyType") or header.get("propertyType"),
@@ -319,12 +776,16 @@ class ContactExtractor:
 
             # Skip parcel fetch if no valid contacts (optimization)
             if not valid_contacts:
+                # Empty only because of email dedupe is not a property-level fact
+                if not any(self._usable(base["company_name"], person) for person in raw_contacts):
+                    self._remember_no_contacts(property_id)
                 return []
 
             # Only fetch parcel data if we have valid contacts and parcel is requested
             if self.include_parcel:
                 logger.info(f"Property {property_id}: Fetching parcel data...")
-                parcel_data = await self._get_parcel_data(property_id)
+                parcel_id = await (parcel_id_task or self._get_parcel_id(property_id))
+                parcel_data = await self._get_parcel_details(property_id, parcel_id) if parcel_id else {}
                 logger.info(f"Property {property_id}: Parcel data = {parcel_data}")
                 # Merge parcel data into each contact
                 for _, contact in valid_contacts:
@@ -334,21 +795,50 @@ class ContactExtractor:
 
             return [contact for _, contact in valid_contacts]
 
+        except CircuitOpenError:
+            raise
         except Exception as e:
             logger.warning(f"Failed to extract property {property_id}: {e}")
+            self._record_failure(property_id, e, market_ids, search_result)
             return []
+        finally:
+            # No-op once awaited; otherwise the property was short-circuited or failed
+            if parcel_id_task:
+                parcel_id_task.cancel()
+
+    def _usable(self, company: Optional[str], person: Dict) -> bool:
+        """Whether a person passes the contact filters, before email dedupe."""
+        if not company or not person.get("name"):
+            return False
+        if self.require_email and not self._valid_email(person.get("email", "")):
+            return False
+        if self.require_phone and not self._format_phones(person.get("phoneNumbers")):
+            return False
+        return True
+
+    def _no_contacts_key(self, property_id: int) -> Dict:
+        return {"propertyId": property_id, "require_email": self.require_email, "require_phone": self.require_phone}
+
+    def _known_no_contacts(self, property_id: int) -> bool:
+        """True if a recent run found no usable contacts for this property under the same filters."""
+        if not self.no_contacts_days:
+            return False
+        entry = self.client.cached_response("no_contacts", self._no_contacts_key(property_id))
+        if not entry or time.time() - entry.get("checked_at", 0) > self.no_contacts_days * 86400:
+            return False
+        self.no_contacts_skipped += 1
+        return True
+
+    def _remember_no_contacts(self, property_id: int):
+        if self.no_contacts_days:
+            self.client.store_response("no_contacts", self._no_contacts_key(property_id), {"checked_at": time.time()})
 
     def _build_contact(self, base: Dict, person: Dict) -> Optional[Dict]:
-        email = person.get("email", "")
+        email = person.get("email") or ""
         phone = self._format_phones(person.get("phoneNumbers"))
         name = person.get("name", "")
-        company = base.get("company_name", "")
 
-        if not company or not name:
-            return None
-        if self.require_email and not self._valid_email(email):
-            return None
-        if self.require_phone and not phone:
+        if not self._usable(base.get("company_name", ""), person):
             return None
 
         email_lower = email.lower()
@@ -366,7 +856,8 @@ class ContactExtractor:
             "phone": phone,
         }
 
-    async def _get_parcel_data(self, property_id: int) -> Dict:
+    async def _get_parcel_id(self, property_id: int) -> Optional[str]:
+        """Look up the property's first parcel PIN (needs only the property ID)."""
         try:
             # Minimal delay between parcel requests
             await asyncio.sleep(random.uniform(0.05, 0.15))
@@ -375,10 +866,15 @@ class ContactExtractor:
             parcel_pins = pins_data.get("parcelPinsFromProperty", {}).get("parcelPins", [])
 
             if not parcel_pins or not parcel_pins[0].get("id"):
-                return {}
+                return None
+            return str(parcel_pins[0]["id"])
 
-            parcel_id = str(parcel_pins[0]["id"])
+        except Exception as e:
+            logger.warning(f"Failed to get parcel data for {property_id}: {e}")
+            return None
 
+    async def _get_parcel_details(self, property_id: int, parcel_id: str) -> Dict:
+        try:
             # Minimal delay before details request
             await asyncio.sleep(random.uniform(0.05, 0.15))
 
@@ -450,7 +946,9 @@ class PropertyEnricher:
     1. PDS REST API for property details (building, location, land, sale)
     2. GraphQL for true owner contacts
     3. GraphQL for parcel PIN lookup
-    4. GraphQL for parcel/loan details
+    4. GraphQL for parcel/loan details (after 3)
+
+    1-3 are independent and run concurrently within a property's slot.
     """
 
     def __init__(
@@ -462,6 +960,8 @@ class PropertyEnricher:
         concurrency: int = 5,
         min_delay: float = 0.2,
         max_delay: float = 0.5,
+        adaptive: bool = False,
+        max_concurrency: int = DEFAULT_MAX,
     ):
         self.client = client
         self.include_contacts = include_contacts
@@ -471,13 +971,17 @@ class PropertyEnricher:
         self.min_delay = min_delay
         self.max_delay = max_delay
         self._semaphore: Optional[asyncio.Semaphore] = None
+        self.controller: Optional[AdaptiveConcurrency] = None
+        if adaptive:
+            self.controller = AdaptiveConcurrency(initial=concurrency, maximum=max_concurrency)
+            client.add_listener(self.controller.record)
 
     async def enrich_properties(self, property_ids: List[int]) -> List[Dict]:
         """Enrich multiple properties with full details.
 
         Returns list of enriched property dicts with all available data.
         """
-        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._semaphore = self.controller or asyncio.Semaphore(self.concurrency)
         results = []
 
         # Process in batches for progress logging
@@ -508,27 +1012,37 @@ class PropertyEnricher:
             return await self._enrich_property(property_id)
 
     async def _enrich_property(self, property_id: int) -> Dict:
-        """Enrich a single property with all available data."""
-        result = {"property_id": property_id}
+        """Enrich a single property with all available data.
 
-        # 1. Get property details from PDS REST API
-        pds_data = await self.client.get_property_details(property_id)
-        if pds_data.get("error"):
-            result["error"] = pds_data["error"]
-            return result
+        PDS details, contacts and the parcel PIN lookup only need the property
+        ID, so they start together; parcel details follow the PIN lookup inside
+        `_get_parcel_and_loans`. A PDS error cancels the other two and returns
+        just the error, as a missing property has nothing to enrich.
+        """
+        result = {"property_id": property_id}
 
-        # Extract and flatten PDS data
-        result.update(self._extract_pds_data(pds_data))
+        want_parcel = self.include_parcel or self.include_loans
+        contacts_task = asyncio.ensure_future(self._get_contacts(property_id)) if self.include_contacts else None
+        parcel_task = asyncio.ensure_future(self._get_parcel_and_loans(property_id)) if want_parcel else None
+        followers = [task for task in (contacts_task, parcel_task) if task]
 
-        # 2. Get contacts if requested
-        if self.include_contacts:
-            contacts = await self._get_contacts(property_id)
-            result["contacts"] = contacts
+        try:
+            pds_data = await self.client.get_property_details(property_id)
+            if pds_data.get("error"):
+                result["error"] = pds_data["error"]
+                return result
 
-        # 3. Get parcel/loan data if requested
-        if self.include_parcel or self.include_loans:
-            parcel_data = await self._get_parcel_and_loans(property_id)
-            result.update(parcel_data)
+            # Extract and flatten PDS data
+            result.update(self._extract_pds_data(pds_data))
+            await asyncio.gather(*followers)
+        finally:
+            for task in followers:
+                task.cancel()
+
+        if contacts_task:
+            result["contacts"] = contacts_task.result()
+        if parcel_task:
+            result.update(parcel_task.result())
 
         return result
 
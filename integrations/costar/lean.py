@@ -0,0 +1,164 @@
+"""CoStar Lean Browser - Request blocking, memory caps and resource stats.
+
+The session tab is only a cookie jar and request executor, so in lean mode
+it skips everything a person would look at: images, fonts, media, styles
+and any host outside CoStar. Blocking is done with Fetch-domain request
+interception, so it applies to every tab it is installed on, and it can be
+switched off while a login page (with its QR code) has to render.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+try:
+    import psutil
+except ImportError:  # Optional: RSS figures are omitted without it
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+LEAN_HEAP_MB = 512  # V8 old-space cap per renderer
+
+LEAN_CHROME_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--mute-audio",
+    "--renderer-process-limit=2",
+    f"--js-flags=--max-old-space-size={LEAN_HEAP_MB}",
+]
+
+BLOCKED_RESOURCE_TYPES = {
+    "Image", "Media", "Font", "Stylesheet", "TextTrack",
+    "Manifest", "Ping", "CSPViolationReport", "SignedExchange",
+}
+ALLOWED_HOST_SUFFIXES = ("costar.com",)
+
+MEMORY_SAMPLE_SECONDS = 5.0
+
+
+def _first_party(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == suffix or host.endswith("." + suffix) for suffix in ALLOWED_HOST_SUFFIXES)
+
+
+class RequestBlocker:
+    """Fails non-essential requests on one tab via Fetch.requestPaused.
+
+    Every request pauses until the handler answers, including CoStar API
+    calls, which are continued immediately. Set `enabled = False` to let
+    everything through (e.g. while the login page renders).
+    """
+
+    def __init__(self, tab):
+        self.tab = tab
+        self.enabled = True
+        self.blocked = 0
+        self.allowed = 0
+
+    async def install(self):
+        from pydoll.protocol.fetch.events import FetchEvent
+
+        await self.tab.enable_fetch_events()
+        await self.tab.on(FetchEvent.REQUEST_PAUSED, self._on_paused)
+
+    async def _on_paused(self, event: Dict):
+        from pydoll.protocol.network.types import ErrorReason
+
+        params = event.get("params", {})
+        request_id = params.get("requestId")
+        url = params.get("request", {}).get("url", "")
+        try:
+            if self.enabled and (params.get("resourceType") in BLOCKED_RESOURCE_TYPES or not _first_party(url)):
+                self.blocked += 1
+                await self.tab.fail_request(request_id, ErrorReason.BLOCKED_BY_CLIENT)
+            else:
+                self.allowed += 1
+                await self.tab.continue_request(request_id)
+        except Exception as e:
+            logger.debug(f"Interception answer failed for {url[:80]}: {e}")
+
+
+class ResourceMonitor:
+    """Samples the browser's resident memory (process tree) and keeps the peak.
+
+    Needs psutil; without it the RSS fields stay None. Navigation timings
+    are recorded by the session through `navigation`.
+    """
+
+    def __init__(self, pid: Optional[int]):
+        self.pid = pid
+        self.rss_mb: Optional[float] = None
+        self.peak_rss_mb: Optional[float] = None
+        self.navigations: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if psutil is None or not self.pid:
+            return
+        self.sample()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(MEMORY_SAMPLE_SECONDS)
+            await asyncio.to_thread(self.sample)
+
+    def sample(self) -> Optional[float]:
+        """Current RSS of the browser and all its child processes, in MB."""
+        if psutil is None or not self.pid:
+            return None
+        try:
+            root = psutil.Process(self.pid)
+            processes: List = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except psutil.Error:
+                    pass  # Renderer exited between listing and reading
+        except psutil.Error:
+            return None
+
+        self.rss_mb = round(total / 1024 / 1024, 1)
+        self.peak_rss_mb = max(self.peak_rss_mb or 0.0, self.rss_mb)
+        return self.rss_mb
+
+    def navigation(self, url: str, seconds: float):
+        self.navigations[urlparse(url).path or "/"] = round(seconds, 3)
+
+    def stats(self) -> Dict:
+        return {
+            "pid": self.pid,
+            "rss_mb": self.rss_mb,
+            "peak_rss_mb": self.peak_rss_mb,
+            "navigation_seconds": dict(self.navigations),
+        }
+
+
+def browser_pid(browser) -> Optional[int]:
+    """PID of a Pydoll browser's Chrome process, if it can be found."""
+    manager = getattr(browser, "_browser_process_manager", None)
+    process = getattr(manager, "_process", None)
+    return getattr(process, "pid", None)
+
+
+async def timed_go_to(tab, url: str, monitor: Optional[ResourceMonitor]):
+    started = time.monotonic()
+    await tab.go_to(url)
+    if monitor:
+        monitor.navigation(url, time.monotonic() - started)
@@ -0,0 +1,118 @@
+"""CoStar Client Metrics - Per-endpoint latency, status, retry and byte counters.
+
+Rendered in Prometheus text exposition format by the service's /metrics
+endpoint; no prometheus_client dependency needed.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = [f'{key}="{str(value)}"' for key, value in labels.items()]
+    return "{" + ",".join(parts) + "}"
+
+
+def render_metric(
+    name: str,
+    kind: str,
+    help_text: str,
+    samples: Sequence[Tuple[Dict[str, str], float]],
+) -> List[str]:
+    """HELP/TYPE header plus one line per (labels, value) sample."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{_labels(labels)} {value}" for labels, value in samples)
+    return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram matching Prometheus semantics."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.total += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def samples(self, name: str, labels: Dict[str, str]) -> List[str]:
+        lines = [
+            f"{name}_bucket{_labels({**labels, 'le': bound})} {count}"
+            for bound, count in zip(self.buckets, self.counts)
+        ]
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {self.count}")
+        lines.append(f"{name}_sum{_labels(labels)} {round(self.total, 6)}")
+        lines.append(f"{name}_count{_labels(labels)} {self.count}")
+        return lines
+
+
+class ClientMetrics:
+    """Aggregates request outcomes across every CoStarClient that shares it."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[str, Histogram] = defaultdict(Histogram)
+        self.statuses: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.retry_sleep: Dict[str, float] = defaultdict(float)
+        self.bytes: Dict[str, int] = defaultdict(int)
+        self.limiter_wait: Dict[str, float] = defaultdict(float)
+
+    def observe(self, endpoint: str, status: Optional[int], latency: float, nbytes: int = 0):
+        with self._lock:
+            self.latency[endpoint].observe(latency)
+            self.statuses[(endpoint, str(status) if status else "none")] += 1
+            self.bytes[endpoint] += nbytes
+
+    def retry(self, endpoint: str, sleep: float = 0.0):
+        with self._lock:
+            self.retries[endpoint] += 1
+            self.retry_sleep[endpoint] += sleep
+
+    def waited(self, endpoint: str, seconds: float):
+        """Time spent blocked on the rate limiter before sending."""
+        if seconds > 0:
+            with self._lock:
+                self.limiter_wait[endpoint] += seconds
+
+    def render(self, prefix: str = "costar_client") -> List[str]:
+        with self._lock:
+            lines = [
+                f"# HELP {prefix}_request_seconds CoStar request latency by endpoint",
+                f"# TYPE {prefix}_request_seconds histogram",
+            ]
+            for endpoint, histogram in sorted(self.latency.items()):
+                lines.extend(histogram.samples(f"{prefix}_request_seconds", {"endpoint": endpoint}))
+
+            lines += render_metric(
+                f"{prefix}_responses_total", "counter", "Responses by endpoint and HTTP status",
+                [({"endpoint": e, "status": s}, n) for (e, s), n in sorted(self.statuses.items())],
+            )
+            lines += render_metric(
+                f"{prefix}_retries_total", "counter", "Retried requests by endpoint",
+                [({"endpoint": e}, n) for e, n in sorted(self.retries.items())],
+            )
+            lines += render_metric(
+                f"{prefix}_retry_sleep_seconds_total", "counter", "Backoff sleep before retries",
+                [({"endpoint": e}, round(v, 3)) for e, v in sorted(self.retry_sleep.items())],
+            )
+            lines += render_metric(
+                f"{prefix}_response_bytes_total", "counter", "Response body bytes by endpoint",
+                [({"endpoint": e}, n) for e, n in sorted(self.bytes.items())],
+            )
+            lines += render_metric(
+                f"{prefix}_rate_limit_wait_seconds_total", "counter", "Time blocked on the shared rate limiter",
+                [({"endpoint": e}, round(v, 3)) for e, v in sorted(self.limiter_wait.items())],
+            )
+            return lines
@@ -0,0 +1,165 @@
+"""CoStar Payload Partitioning - Split oversized searches to get past the result cap.
+
+list-properties returns at most `MAX_SEARCH_PAGES` x `PAGE_SIZE` rows, so a
+broad payload silently truncates. The partitioner counts each payload and
+recursively splits the ones that are too big until every piece fits:
+
+1. Geography: `0.Geography.Filter.Ids` halves (one market per piece at the limit)
+2. Property type: `0.Property.PropertyTypes` halves
+3. Building size: bisects `0.Property.Building.BuildingArea` min/max
+
+Sub-searches are then run in turn and deduplicated by PropertyId.
+"""
+
+import asyncio
+import copy
+import logging
+import math
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from .client import PAGE_SIZE, CoStarClient
+
+logger = logging.getLogger(__name__)
+
+MAX_SEARCH_PAGES = 10
+MAX_RESULTS = MAX_SEARCH_PAGES * PAGE_SIZE
+MAX_DEPTH = 12
+BUILDING_AREA_MAX = 50_000_000  # SF, upper bound when only a minimum is set
+
+
+def _halves(values: List) -> Tuple[List, List]:
+    mid = len(values) // 2
+    return values[:mid], values[mid:]
+
+
+def _building_area(payload: Dict) -> Optional[Dict]:
+    return payload.get("0", {}).get("Property", {}).get("Building", {}).get("BuildingArea")
+
+
+def split_payload(payload: Dict) -> List[Dict]:
+    """Split a payload into smaller disjoint payloads.
+
+    Returns an empty list when no dimension can be narrowed further.
+    """
+    filters = payload.get("0", {})
+
+    geo_ids = filters.get("Geography", {}).get("Filter", {}).get("Ids")
+    if isinstance(geo_ids, list) and len(geo_ids) > 1:
+        pieces = []
+        for half in _halves(geo_ids):
+            piece = copy.deepcopy(payload)
+            piece["0"]["Geography"]["Filter"]["Ids"] = half
+            pieces.append(piece)
+        return pieces
+
+    property_types = filters.get("Property", {}).get("PropertyTypes")
+    if isinstance(property_types, list) and len(property_types) > 1:
+        pieces = []
+        for half in _halves(property_types):
+            piece = copy.deepcopy(payload)
+            piece["0"]["Property"]["PropertyTypes"] = half
+            pieces.append(piece)
+        return pieces
+
+    # Only narrow an existing size filter; adding one would drop properties
+    # with no recorded building area from the results.
+    area = _building_area(payload)
+    if area:
+        low = int((area.get("Minimum") or {}).get("Value") or 0)
+        high = int((area.get("Maximum") or {}).get("Value") or BUILDING_AREA_MAX)
+        if high - low < 2:
+            return []
+
+        # Building sizes are heavy-tailed, so split on the geometric midpoint
+        mid = int(math.sqrt(low * high)) if low > 0 else high // 2
+        mid = min(max(mid, low), high - 1)
+        code = (area.get("Minimum") or area.get("Maximum") or {}).get("Code", "[sft_i]")
+
+        pieces = []
+        for lo, hi in ((low, mid), (mid + 1, high)):
+            piece = copy.deepcopy(payload)
+            piece["0"]["Property"]["Building"]["BuildingArea"] = {
+                "Minimum": {"Value": lo, "Code": code},
+                "Maximum": {"Value": hi, "Code": code},
+            }
+            pieces.append(piece)
+        return pieces
+
+    return []
+
+
+class PayloadPartitioner:
+    """Plans and runs sub-searches so each stays under the per-search result cap."""
+
+    def __init__(
+        self,
+        client: CoStarClient,
+        max_results: int = MAX_RESULTS,
+        max_depth: int = MAX_DEPTH,
+    ):
+        self.client = client
+        self.max_results = max_results
+        self.max_depth = max_depth
+
+    async def plan(self, payload: Dict, depth: int = 0) -> List[Dict]:
+        """Return sub-payloads whose counts each fit under `max_results`."""
+        counts = await self.client.count_properties(payload)
+        total = counts.get("PropertyCount")
+
+        if counts.get("error") or total is None:
+            logger.warning("Count unavailable, searching payload without partitioning")
+            return [payload]
+        if total == 0:
+            return []
+        if total <= self.max_results:
+            return [payload]
+
+        pieces = split_payload(payload) if depth < self.max_depth else []
+        if not pieces:
+            logger.warning(f"Cannot split payload further: {total} properties, results capped at {self.max_results}")
+            return [payload]
+
+        logger.info(f"Partitioning payload with {total} properties into {len(pieces)} (depth {depth + 1})")
+        plans = await asyncio.gather(*[self.plan(piece, depth + 1) for piece in pieces])
+        return [sub for plan in plans for sub in plan]
+
+    async def iter_pages(self, payload: Dict, max_rows: Optional[int] = None) -> AsyncIterator[List[Dict]]:
+        """Yield pages from every sub-search, skipping properties already seen.
+
+        When `max_rows` fits under the result cap the payload is searched
+        unsplit, skipping the count-based planning entirely.
+        """
+        if max_rows and max_rows <= self.max_results:
+            plan = [payload]
+        else:
+            plan = await self.plan(payload)
+        max_pages = math.ceil(self.max_results / PAGE_SIZE)
+        seen = set()
+
+        logger.info(f"Running {len(plan)} sub-search(es)")
+        for sub_payload in plan:
+            remaining = max(1, max_rows - len(seen)) if max_rows else None
+            pages = self.client.iter_search_pages(sub_payload, max_pages=max_pages, max_rows=remaining)
+            try:
+                async for properties in pages:
+                    fresh = []
+                    for prop in properties:
+                        property_id = prop.get("PropertyId") or prop.get("i")
+                        if property_id is not None:
+                            if property_id in seen:
+                                continue
+                            seen.add(property_id)
+                        fresh.append(prop)
+                    if fresh:
+                        yield fresh
+            finally:
+                await pages.aclose()
+
+    async def search(self, payload: Dict) -> List[Dict]:
+        """Full deduplicated result set for a payload of any size."""
+        all_pins = []
+        async for properties in self.iter_pages(payload):
+            all_pins.extend(properties)
+
+        logger.info(f"Partitioned total: {len(all_pins)} properties")
+        return all_pins
@@ -0,0 +1,128 @@
+"""CoStar Session Pool - Several tabs on one login, with least-loaded dispatch.
+
+All tabs live in the session's browser context, so they share its cookies:
+one login (and one re-auth) covers every tab. Clients are built on the
+pool's dispatcher instead of a single tab, and each request goes to the tab
+with the fewest requests in flight. The session's token bucket and circuit
+breakers stay shared, so the global request budget is unchanged:
+
+    async with CoStarSession() as session:
+        pool = CoStarSessionPool(session, size=4)
+        await pool.open()
+        client = CoStarClient(pool.tab, limiter=pool.rate_limiter, breakers=pool.circuit_breakers)
+"""
+
+import asyncio
+import logging
+from typing import Dict, List
+
+from .session import ORIGIN_URL, CoStarSession
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABS = 1
+MAX_TABS = 8
+
+
+class _DispatchRequests:
+    def __init__(self, dispatcher: "TabDispatcher"):
+        self.dispatcher = dispatcher
+
+    async def post(self, url: str, **kwargs):
+        return await self.dispatcher.dispatch("post", url, **kwargs)
+
+    async def get(self, url: str, **kwargs):
+        return await self.dispatcher.dispatch("get", url, **kwargs)
+
+
+class TabDispatcher:
+    """Tab stand-in that sends each request through the least-loaded of several tabs.
+
+    Ties go to the tab that has sent the fewest requests, so idle tabs are
+    used round-robin rather than always the first one.
+    """
+
+    def __init__(self, tabs: List):
+        if not tabs:
+            raise ValueError("TabDispatcher needs at least one tab")
+        self.tabs = list(tabs)
+        self.in_flight = [0] * len(self.tabs)
+        self.sent = [0] * len(self.tabs)
+        self.request = _DispatchRequests(self)
+
+    def add_tab(self, tab):
+        self.tabs.append(tab)
+        self.in_flight.append(0)
+        self.sent.append(0)
+
+    def _pick(self) -> int:
+        return min(range(len(self.tabs)), key=lambda i: (self.in_flight[i], self.sent[i]))
+
+    async def dispatch(self, method: str, url: str, **kwargs):
+        index = self._pick()
+        self.in_flight[index] += 1
+        self.sent[index] += 1
+        try:
+            sender = self.tabs[index].request
+            return await (sender.get(url, **kwargs) if method == "get" else sender.post(url, **kwargs))
+        finally:
+            self.in_flight[index] -= 1
+
+    def stats(self) -> List[Dict]:
+        return [
+            {"tab": i, "in_flight": self.in_flight[i], "sent": self.sent[i]}
+            for i in range(len(self.tabs))
+        ]
+
+
+class CoStarSessionPool:
+    """K tabs sharing one authenticated CoStarSession.
+
+    The session's own tab is tab 0; `open()` adds the rest, each parked on
+    a tiny CoStar document so its in-page requests carry the origin and cookies.
+    """
+
+    def __init__(self, session: CoStarSession, size: int = DEFAULT_TABS):
+        if not 1 <= size <= MAX_TABS:
+            raise ValueError(f"Pool size must be between 1 and {MAX_TABS}, got {size}")
+        self.session = session
+        self.size = size
+        self.tab = TabDispatcher([session.tab])
+
+    @property
+    def rate_limiter(self):
+        return self.session.rate_limiter
+
+    @property
+    def circuit_breakers(self):
+        return self.session.circuit_breakers
+
+    async def open(self):
+        """Open the extra tabs; a tab that fails to open just shrinks the pool."""
+        async def open_tab(index: int):
+            try:
+                tab = await self.session.browser.new_tab()
+                await self.session.prepare_tab(tab)
+                await tab.go_to(ORIGIN_URL)
+                return tab
+            except Exception as e:
+                logger.warning(f"Could not open pool tab {index}: {e}")
+                return None
+
+        tabs = await asyncio.gather(*(open_tab(i) for i in range(1, self.size)))
+        for tab in tabs:
+            if tab:
+                self.tab.add_tab(tab)
+        logger.info(f"Session pool ready with {len(self.tab.tabs)}/{self.size} tabs")
+
+    async def close(self):
+        """Close the extra tabs; the session's own tab is left to the session."""
+        for tab in self.tab.tabs[1:]:
+            try:
+                await tab.close()
+            except Exception as e:
+                logger.debug(f"Closing pool tab failed: {e}")
+        del self.tab.tabs[1:], self.tab.in_flight[1:], self.tab.sent[1:]
+
+    def stats(self) -> Dict:
+        return {"size": len(self.tab.tabs), "tabs": self.tab.stats()}
@@ -20,8 +20,15 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 from ..session import CoStarSession
+from ..cache import ResponseCache
+from ..cassette import Cassette
+from ..checkpoint import CheckpointStore
 from ..client import CoStarClient
+from ..deadletter import DeadLetterQueue
+from ..dedupe import PropertyIndex
 from ..extract import ContactExtractor
+from ..sinks import ContactSink
+from ..transport import HTTP, TAB, TRANSPORTS
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +50,12 @@ class SellerQuery:
     max_delay: float = 2.0
     burst_size: int = 50
     burst_delay: float = 5.0
+    batch_size: int = 1  # Properties per contacts request (1 = no batching)
+    concurrent_pages: bool = False
+    partition: bool = False  # Split payloads larger than the 20k search cap
+    adaptive: bool = False  # Tune concurrency from response health (AIMD)
+    transport: str = TAB  # "http" bypasses the tab with the session's cookies
+    no_contacts_days: Optional[float] = None  # Skip properties recently found empty (None = off)
 
 
 @dataclass
@@ -53,6 +66,8 @@ class SellerResult:
     properties_processed: int
     query_name: str
     errors: List[str] = field(default_factory=list)
+    duplicates_skipped: int = 0  # Properties already extracted by an earlier query
+    no_contacts_skipped: int = 0  # Properties skipped as recently found to have no contacts
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -61,6 +76,8 @@ class SellerResult:
             "query_name": self.query_name,
             "contact_count": len(self.contacts),
             "errors": self.errors,
+            "duplicates_skipped": self.duplicates_skipped,
+            "no_contacts_skipped": self.no_contacts_skipped,
         }
 
 
@@ -76,7 +93,25 @@ async def find_sellers(
     max_delay: float = 2.0,
     burst_size: int = 50,
     burst_delay: float = 5.0,
+    batch_size: int = 1,
+    concurrent_pages: bool = False,
+    partition: bool = False,
+    adaptive: bool = False,
+    use_cache: bool = True,
+    refresh_cache: bool = False,
+    cache: Optional[ResponseCache] = None,
+    dead_letters: Optional[DeadLetterQueue] = None,
+    cassette: Optional[Cassette] = None,
+    sink: Optional[ContactSink] = None,
+    checkpoint: Optional[CheckpointStore] = None,
+    run_id: Optional[str] = None,
+    resume: Optional[str] = None,
+    property_index: Optional[PropertyIndex] = None,
+    source: Optional[str] = None,
+    no_contacts_days: Optional[float] = None,
+    transport: str = TAB,
     session: Optional[CoStarSession] = None,
+    stats: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Find property owner contacts (sellers) from a CoStar search payload.
@@ -93,7 +128,32 @@ async def find_sellers(
         max_delay: Max delay between requests in seconds
         burst_size: Properties before taking a pause
         burst_delay: Seconds to pause between bursts
+        batch_size: Properties packed into one aliased contacts request (1 = off)
+        concurrent_pages: Count first, then fetch all search pages in parallel
+        partition: Split payloads over the per-search result cap into sub-searches
+        adaptive: Start at `concurrency` and let AIMD raise/cut it from 429s, 5xx and latency
+        use_cache: Serve contacts/parcel lookups from the local response cache
+        refresh_cache: Refetch everything but still update the cache
+        cache: Existing ResponseCache (optional, opens the default one if not provided)
+        dead_letters: Queue that failed properties are written to for later retry
+        cassette: Record the run's CoStar traffic, or replay a recording without a browser
+        sink: Write each contact here as soon as its property completes instead of
+            collecting them; the returned list is then empty
+        checkpoint: Persist progress so an interrupted run can be resumed
+        run_id: ID to checkpoint a new run under (generated if omitted)
+        resume: Run ID to resume from its checkpoint (opens the default store if needed);
+            only contacts not emitted by the earlier attempt are returned
+        property_index: Shared index of already-extracted properties; properties in it
+            are skipped (pass the same one to several calls to dedupe across them)
+        source: Label recorded in property_index for payload attribution
+        no_contacts_days: Skip properties that had no usable contacts (under the same
+            require_email/require_phone) within this many days; None (default) re-checks
+            everything. Needs the response cache. NO_CONTACTS_DAYS is the suggested window.
+        transport: "tab" sends requests through the browser tab; "http" sends them
+            directly with the session's cookies over a pooled HTTP/2 client (needs httpx)
         session: Existing CoStar session (optional, creates new if not provided)
+        stats: Dict to fill with run counters (properties_processed, failed_properties,
+            no_contacts_skipped) once extraction ends
 
     Returns:
         List of contact dicts with property and company info.
@@ -107,8 +167,27 @@ async def find_sellers(
 
     logger.info(f"find_sellers: {len(payload_list)} payload(s), max={max_properties}, headless={headless}")
 
-    async def _run_with_session(sess: CoStarSession) -> List[Dict]:
-        client = CoStarClient(sess.tab, rate_limit=1.0)
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {transport!r} (expected one of {', '.join(TRANSPORTS)})")
+
+    if cassette:
+        # Cache hits never reach the tab, so they would be missing from the recording
+        use_cache = False
+    if use_cache and cache is None:
+        cache = ResponseCache()
+    if (resume or run_id) and checkpoint is None:
+        checkpoint = CheckpointStore()
+
+    async def _run_with_session(sess: Optional[CoStarSession]) -> List[Dict]:
+        client = CoStarClient(
+            sess.tab if sess else None,
+            limiter=sess.rate_limiter if sess else None,
+            cache=cache if use_cache else None,
+            cache_bypass=refresh_cache,
+            breakers=sess.circuit_breakers if sess else None,
+            cassette=cassette,
+            transport=await sess.http_transport() if sess and transport == HTTP else None,
+        )
         extractor = ContactExtractor(
             client=client,
             require_email=require_email,
@@ -120,10 +199,39 @@ async def find_sellers(
             max_delay=max_delay,
             burst_size=burst_size,
             burst_delay=burst_delay,
+            batch_size=batch_size,
+            concurrent_pages=concurrent_pages,
+            partition=partition,
+            adaptive=adaptive,
+            dead_letters=dead_letters,
+            checkpoint=checkpoint,
+            run_id=run_id,
+            resume=resume,
+            property_index=property_index,
+            source=source,
+            no_contacts_days=no_contacts_days,
         )
-        return await extractor.extract_from_payloads(payload_list, max_properties)
+        try:
+            if not sink:
+                return await extractor.extract_from_payloads(payload_list, max_properties)
+
+            try:
+                async for contact in extractor.iter_contacts(payload_list, max_properties):
+                    await sink.write(contact)
+            finally:
+                await sink.flush()
+            return []
+        finally:
+            if stats is not None:
+                stats.update(
+                    properties_processed=extractor._properties_processed,
+                    failed_properties=len(extractor.failed_properties),
+                    no_contacts_skipped=extractor.no_contacts_skipped,
+                )
 
-    # Use provided session or create new one
+    # Use provided session or create new one; replay needs no browser at all
+    if cassette and cassette.replaying:
+        return await _run_with_session(None)
     if session:
         return await _run_with_session(session)
     else:
@@ -134,6 +242,7 @@ async def find_sellers(
 async def find_sellers_batch(
     queries: List[SellerQuery],
     headless: bool = True,
+    dedupe_across_queries: bool = False,
 ) -> List[SellerResult]:
     """
     Run multiple seller queries in a single session.
@@ -144,14 +253,20 @@ async def find_sellers_batch(
     Args:
         queries: List of SellerQuery configurations
         headless: Run browser in background
+        dedupe_across_queries: Extract each property only for the first query that
+            matches it; later queries skip it (see SellerResult.duplicates_skipped)
 
     Returns:
         List of SellerResult objects, one per query
     """
     results = []
+    cache = ResponseCache()
+    property_index = PropertyIndex() if dedupe_across_queries else None
 
     async with CoStarSession(headless=headless) as session:
         for query in queries:
+            skipped_before = property_index.duplicates if property_index else 0
+            stats: Dict[str, Any] = {}
             try:
                 contacts = await find_sellers(
                     payload=query.payload,
@@ -165,12 +280,24 @@ async def find_sellers_batch(
                     max_delay=query.max_delay,
                     burst_size=query.burst_size,
                     burst_delay=query.burst_delay,
+                    batch_size=query.batch_size,
+                    concurrent_pages=query.concurrent_pages,
+                    partition=query.partition,
+                    adaptive=query.adaptive,
+                    transport=query.transport,
+                    no_contacts_days=query.no_contacts_days,
+                    stats=stats,
+                    cache=cache,
+                    property_index=property_index,
+                    source=query.name,
                     session=session,
                 )
                 results.append(SellerResult(
                     contacts=contacts,
-                    properties_processed=len(contacts),  # Approximate
+                    properties_processed=stats.get("properties_processed", len(contacts)),
                     query_name=query.name,
+                    duplicates_skipped=(property_index.duplicates - skipped_before) if property_index else 0,
+                    no_contacts_skipped=stats.get("no_contacts_skipped", 0),
                 ))
             except Exception as e:
                 logger.error(f"Query '{query.name}' failed: {e}")
@@ -0,0 +1,85 @@
+"""CoStar Rate Limiting - Shared token bucket for all clients on a session."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Token cost per request type. list-properties returns up to 2,000 rich rows
+# per call so it is the most expensive; count is a cheap aggregate.
+ENDPOINT_WEIGHTS: Dict[str, float] = {
+    "graphql": 1.0,
+    "search": 3.0,
+    "count": 0.5,
+    "pds": 1.0,
+}
+
+# Matches the per-client `rate_limit=1.0` spacing clients used before the
+# shared bucket; raise it explicitly (service --rps/--burst) to go faster.
+# The service's /enrich used its own rate_limit=0.5 (~2 rps) before and now
+# shares this budget with every other job.
+DEFAULT_RATE = 1.0  # Tokens refilled per second
+DEFAULT_BURST = 2.0  # Bucket capacity
+
+
+class TokenBucket:
+    """Async token bucket shared by every CoStarClient bound to one tab.
+
+    Requests draw `weights[endpoint]` tokens; the bucket refills at `rate`
+    tokens/second up to `capacity`, so short bursts are allowed while the
+    aggregate request rate across concurrent jobs stays bounded.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        capacity: float = DEFAULT_BURST,
+        weights: Optional[Dict[str, float]] = None,
+    ):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.weights = {**ENDPOINT_WEIGHTS, **(weights or {})}
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.acquired = 0
+        self.wait_time = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, endpoint: str = "graphql"):
+        """Wait until enough tokens are available for `endpoint`, then take them."""
+        cost = min(self.weights.get(endpoint, 1.0), self.capacity)
+        started = time.monotonic()
+
+        # Holding the lock while sleeping keeps waiters FIFO across clients
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    break
+                await asyncio.sleep((cost - self._tokens) / self.rate)
+
+        self.acquired += 1
+        self.wait_time += time.monotonic() - started
+
+    def stats(self) -> Dict:
+        """Read-only snapshot; safe to call from other threads (Flask handlers)."""
+        tokens, updated = self._tokens, self._updated
+        available = min(self.capacity, tokens + (time.monotonic() - updated) * self.rate)
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "tokens": round(available, 2),
+            "acquired": self.acquired,
+            "wait_time": round(self.wait_time, 2),
+        }
@@ -10,6 +10,9 @@ Usage:
         --query-type find_sellers \
         --payload '{"0": {...}}' \
         --max-properties 100
+
+With --stream, find_sellers prints one contact per line (NDJSON) as soon as
+it is found and ends with a summary line, so partial results survive a crash.
 """
 
 import argparse
@@ -17,12 +20,18 @@ import asyncio
 import json
 import logging
 import sys
+import uuid
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from integrations.costar.cassette import Cassette
+from integrations.costar.checkpoint import CheckpointStore
+from integrations.costar.extract import NO_CONTACTS_DAYS
 from integrations.costar.queries import find_sellers
+from integrations.costar.sinks import NDJSONSink
+from integrations.costar.transport import TAB, TRANSPORTS
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,22 +42,73 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class StreamSummarySink(NDJSONSink):
+    """NDJSON contacts on stdout, tracking properties for the closing summary line."""
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+        self.property_ids = set()
+
+    async def write(self, contact: dict):
+        self.property_ids.add(contact.get("property_id"))
+        await super().write(contact)
+
+
 async def run_find_sellers(payload: dict, options: dict) -> dict:
     """Run find_sellers query and return results."""
+    cassette = None
+    if options.get("record"):
+        cassette = Cassette(options["record"], mode="record")
+    elif options.get("replay"):
+        cassette = Cassette(options["replay"], mode="replay", time_scale=options.get("replay_speed", 1.0))
+
+    sink = StreamSummarySink() if options.get("stream") else None
+
+    checkpoint = None
+    run_id = None
+    if options.get("checkpoint") or options.get("resume"):
+        checkpoint = CheckpointStore()
+        if not options.get("resume"):
+            run_id = uuid.uuid4().hex[:12]
+            logger.info(f"Checkpointing as run {run_id} (resume with --resume {run_id})")
+
+    stats = {}
     try:
         contacts = await find_sellers(
             payload=payload,
             max_properties=options.get("max_properties"),
             include_parcel=options.get("include_parcel", False),
             headless=options.get("headless", True),
+            use_cache=options.get("use_cache", True),
+            refresh_cache=options.get("refresh_cache", False),
+            cassette=cassette,
+            sink=sink,
+            checkpoint=checkpoint,
+            run_id=run_id,
+            resume=options.get("resume"),
+            transport=options.get("transport", TAB),
+            no_contacts_days=options.get("skip_no_contacts"),
+            stats=stats,
         )
+        run = {"runId": run_id or options.get("resume")} if checkpoint else {}
+        summary = {"noContactsSkipped": stats.get("no_contacts_skipped", 0), **run}
+        if sink:
+            return {"done": True, "contactCount": sink.written, "propertiesProcessed": len(sink.property_ids), **summary}
         return {
             "contacts": contacts,
             "propertiesProcessed": len(set(c.get("property_id") for c in contacts)),
+            **summary,
         }
     except Exception as e:
         logger.error(f"find_sellers failed: {e}")
+        if sink:
+            return {"done": False, "error": str(e), "contactCount": sink.written}
         return {"error": str(e), "contacts": []}
+    finally:
+        if cassette:
+            cassette.close()
+        if checkpoint:
+            checkpoint.close()
 
 
 async def run_find_buyers(payload: dict, options: dict) -> dict:
@@ -85,6 +145,62 @@ async def main():
         action="store_true",
         help="Include parcel/loan data",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the local response cache",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Refetch from CoStar and overwrite cached responses",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Record all CoStar traffic to a cassette file (.jsonl.gz)",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="Replay a recorded cassette instead of calling CoStar",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Scale recorded response times on replay (0 = no delay)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print each contact as an NDJSON line as soon as it is found, then a summary line",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Save progress to the local checkpoint store so the run can be resumed",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume a checkpointed run, skipping properties it already finished",
+    )
+    parser.add_argument(
+        "--skip-no-contacts",
+        type=float,
+        nargs="?",
+        const=NO_CONTACTS_DAYS,
+        default=None,
+        metavar="DAYS",
+        help=f"Skip properties found to have no usable contacts within DAYS (default {NO_CONTACTS_DAYS:g}); needs the cache",
+    )
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=TAB,
+        help="Send requests through the browser tab, or directly over HTTP with its cookies",
+    )
     parser.add_argument(
         "--no-headless",
         action="store_true",
@@ -104,6 +220,16 @@ async def main():
         "max_properties": args.max_properties,
         "include_parcel": args.include_parcel,
         "headless": not args.no_headless,
+        "use_cache": not args.no_cache,
+        "refresh_cache": args.refresh_cache,
+        "record": args.record,
+        "replay": args.replay,
+        "replay_speed": args.replay_speed,
+        "stream": args.stream,
+        "checkpoint": args.checkpoint,
+        "resume": args.resume,
+        "transport": args.transport,
+        "skip_no_contacts": args.skip_no_contacts,
     }
 
     logger.info(f"Running {args.query_type} query...")
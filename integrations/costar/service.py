@@ -15,6 +15,10 @@ API Endpoints:
     POST /auth          - Trigger re-authentication
     POST /query         - Execute a query using the session
     POST /count         - Get property counts for payloads (fast preview)
+    POST /enrich        - Enrich properties with full details
+    POST /retry-failed  - Retry properties that failed in earlier runs
+    GET  /runs          - Checkpointed find_sellers runs (resume via options.resume)
+    GET  /metrics       - Prometheus metrics (latency, retries, jobs, loop lag)
 """
 
 import asyncio
@@ -25,6 +29,7 @@ import signal
 import sys
 import threading
 import time
+import uuid
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -37,9 +42,18 @@ from flask_cors import CORS
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from integrations.costar.session import CoStarSession
+from integrations.costar.session import DEFAULT_USER_DATA_DIR, HOME_URLS, CoStarSession
+from integrations.costar.adaptive import DEFAULT_MAX
+from integrations.costar.cache import DEFAULT_CACHE_PATH, ResponseCache
+from integrations.costar.checkpoint import DEFAULT_CHECKPOINT_PATH, CheckpointStore
 from integrations.costar.client import CoStarClient
+from integrations.costar.deadletter import DEFAULT_DEAD_LETTER_PATH, DeadLetterQueue
 from integrations.costar.extract import ContactExtractor, PropertyEnricher
+from integrations.costar.metrics import ClientMetrics, render_metric
+from integrations.costar.partition import PayloadPartitioner
+from integrations.costar.pool import DEFAULT_TABS, MAX_TABS, CoStarSessionPool
+from integrations.costar.ratelimit import DEFAULT_BURST, DEFAULT_RATE
+from integrations.costar.transport import HTTP, TAB, TRANSPORTS
 
 load_dotenv()
 
@@ -60,14 +74,45 @@ class SessionState:
     error: Optional[str] = None
     queries_run: int = 0
     browser_pid: Optional[int] = None
+    last_verified: Optional[str] = None  # Last time CoStar accepted an authenticated call
+    auth_ok: bool = False
+    cookie_rotations: int = 0
 
 state = SessionState()
 session: Optional[CoStarSession] = None
+session_pool: Optional[CoStarSessionPool] = None
 session_lock = threading.Lock()
 loop: Optional[asyncio.AbstractEventLoop] = None
+response_cache: Optional[ResponseCache] = None
+dead_letters: Optional[DeadLetterQueue] = None
+checkpoints: Optional[CheckpointStore] = None
+client_metrics = ClientMetrics()
 
-# Cookie expiry tracking (conservative estimate)
-COOKIE_VALID_HOURS = 2
+# Jobs scheduled on the session loop: queued = waiting to start, running = started
+job_counts = {"queued": 0, "running": 0}
+job_lock = threading.Lock()
+loop_stats = {"lag_seconds": 0.0, "max_lag_seconds": 0.0}
+
+# One successful auth check vouches for the session this long; the keepalive renews it
+VERIFIED_VALID_HOURS = 2
+
+KEEPALIVE_SECONDS = 300  # Between background auth checks
+REAUTH_SECONDS = 120  # Time allowed to complete a login in the browser
+
+# Aggregate request budget shared by every job on the session's tab
+rate_settings = {"requests_per_second": DEFAULT_RATE, "burst": DEFAULT_BURST}
+
+# Transport used when a request's options don't name one
+transport_settings = {"default": TAB}
+
+# Tabs opened on the one login; jobs' requests go to the least-loaded tab
+pool_settings = {"tabs": DEFAULT_TABS}
+
+# Browser options for the next session start. The service is the one
+# long-lived session, so it keeps a persistent profile (one user at a time)
+browser_settings = {"lean": False, "user_data_dir": DEFAULT_USER_DATA_DIR}
+
+keepalive_settings = {"interval": KEEPALIVE_SECONDS}
 
 app = Flask(__name__)
 CORS(app)
@@ -81,13 +126,165 @@ def update_state(**kwargs):
             setattr(state, key, value)
 
 
+async def make_client(options: Dict[str, Any]) -> CoStarClient:
+    """Build a client on the session's tab pool, sharing its rate limiter and the response cache.
+
+    With options.transport == "http" requests bypass the tab and go through
+    the session's direct HTTP transport (same cookies, pooled connections).
+    """
+    transport = options.get("transport", transport_settings["default"])
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {transport!r} (expected one of {', '.join(TRANSPORTS)})")
+
+    return CoStarClient(
+        session_pool.tab if session_pool else session.tab,
+        transport=await session.http_transport() if transport == HTTP else None,
+        limiter=session.rate_limiter,
+        cache=response_cache if options.get("use_cache", True) else None,
+        cache_bypass=options.get("refresh_cache", False),
+        breakers=session.circuit_breakers,
+        metrics=client_metrics,
+        ready=session.ready,
+    )
+
+
+def schedule_job(coro) -> bool:
+    """Run a coroutine on the session's event loop, tracking queue depth and in-flight jobs."""
+    if not (loop and loop.is_running()):
+        coro.close()
+        return False
+
+    with job_lock:
+        job_counts["queued"] += 1
+
+    async def tracked():
+        # Jobs queued during a re-auth start once it completes instead of failing
+        if session and not session.ready.is_set():
+            await session.ready.wait()
+        with job_lock:
+            job_counts["queued"] -= 1
+            job_counts["running"] += 1
+        try:
+            await coro
+        finally:
+            with job_lock:
+                job_counts["running"] -= 1
+
+    asyncio.run_coroutine_threadsafe(tracked(), loop)
+    return True
+
+
 def is_session_valid() -> bool:
-    """Check if session is still valid based on last auth time."""
-    if state.status != "connected" or not state.last_auth:
+    """Check if CoStar accepted the session's most recent authenticated call."""
+    if state.status != "connected" or not state.auth_ok or not state.last_verified:
+        return False
+
+    if session and session.circuit_breakers.needs_reauth:
         return False
 
-    last_auth = datetime.fromisoformat(state.last_auth)
-    return datetime.now() - last_auth < timedelta(hours=COOKIE_VALID_HOURS)
+    last_verified = datetime.fromisoformat(state.last_verified)
+    return datetime.now() - last_verified < timedelta(hours=VERIFIED_VALID_HOURS)
+
+
+def session_unavailable():
+    """Error response when jobs can't be accepted, else None.
+
+    Jobs are accepted while a re-auth is pending; they wait on session.ready.
+    """
+    if not session or state.status not in ("connected", "authenticating"):
+        return jsonify({"error": "Session not connected"}), 400
+
+    if state.status == "connected" and not is_session_valid():
+        return jsonify({"error": "Session expired - please re-authenticate"}), 401
+
+    return None
+
+
+async def reauthenticate():
+    """Sign in again with the stored credentials; jobs hold until it ends.
+
+    The credential login waits for the QR approval; if it does not complete,
+    the login page stays open for a manual sign-in until REAUTH_SECONDS.
+    A timeout leaves the session connected but unverified, so the keepalive
+    (or POST /auth) tries again instead of the session shutting down.
+    """
+    session.ready.clear()
+    update_state(status="authenticating", auth_ok=False)
+    try:
+        if await session._login() or await wait_for_manual_login():
+            await session.sync_cookies()
+            session.circuit_breakers.reset()
+            now = datetime.now().isoformat()
+            update_state(status="connected", last_auth=now, last_verified=now, auth_ok=True, error=None)
+            logger.info("Re-authentication successful!")
+            return
+
+        logger.warning("Re-authentication timed out; will retry on the next keepalive or POST /auth")
+        update_state(status="connected", auth_ok=False, error="Auth timeout")
+    except Exception as e:
+        logger.error(f"Re-authentication failed: {e}")
+        update_state(status="connected", auth_ok=False, error=str(e))
+    finally:
+        # Waiting jobs proceed either way; after a failed re-auth they fail on their own
+        session.ready.set()
+
+
+async def wait_for_manual_login() -> bool:
+    """Poll the login page `_login` left open until the user reaches a CoStar home page."""
+    # Lean blocking would hide the login form's QR code
+    session.blocking = False
+    try:
+        logger.info("Waiting for a manual login - please authenticate in the browser")
+
+        for _ in range(REAUTH_SECONDS):
+            await asyncio.sleep(1)
+            url = await session._get_url()
+            if any(home in url for home in HOME_URLS) or "home" in url.lower():
+                return True
+        return False
+    finally:
+        session.blocking = True
+
+
+async def verify_session():
+    """One cheap authenticated call; saves rotated cookies, or starts a re-auth if rejected."""
+    await session.rate_limiter.acquire("count")
+    try:
+        ok = await session.check_auth()
+    except Exception as e:
+        # No answer says nothing about the cookies; try again next round
+        logger.warning(f"Session check failed: {e}")
+        return
+
+    if ok is None:
+        logger.warning("Session check inconclusive (no JSON and no auth error); retrying next round")
+        return
+    if not ok:
+        logger.warning("CoStar rejected the session cookies; re-authenticating")
+        await reauthenticate()
+        return
+
+    update_state(last_verified=datetime.now().isoformat(), auth_ok=True)
+    if session.circuit_breakers.needs_reauth:
+        logger.info("Auth check passed; closing circuits opened by auth failures")
+        session.circuit_breakers.reset()
+    if await session.sync_cookies():
+        state.cookie_rotations += 1
+        logger.info("CoStar rotated session cookies; saved the new ones")
+
+
+async def keepalive():
+    """Exercise the session every keepalive interval, or at once when auth failures open a circuit."""
+    last_check = time.monotonic()
+    while state.status in ("connected", "authenticating"):
+        await asyncio.sleep(1)
+        if state.status != "connected":
+            continue
+        due = time.monotonic() - last_check >= keepalive_settings["interval"]
+        # After a failed re-auth, wait for the interval rather than retrying every second
+        if due or (session.circuit_breakers.needs_reauth and state.auth_ok):
+            last_check = time.monotonic()
+            await verify_session()
 
 
 @app.route("/status", methods=["GET"])
@@ -97,9 +294,18 @@ def get_status():
         **asdict(state),
         "session_valid": is_session_valid(),
         "expires_in_minutes": max(0, int(
-            (timedelta(hours=COOKIE_VALID_HOURS) -
-             (datetime.now() - datetime.fromisoformat(state.last_auth))).total_seconds() / 60
-        )) if state.last_auth and state.status == "connected" else 0,
+            (timedelta(hours=VERIFIED_VALID_HOURS) -
+             (datetime.now() - datetime.fromisoformat(state.last_verified))).total_seconds() / 60
+        )) if is_session_valid() else 0,
+        "keepalive_seconds": keepalive_settings["interval"],
+        "rate_limiter": session.rate_limiter.stats() if session else None,
+        "cache": response_cache.stats() if response_cache else None,
+        "needs_reauth": session.circuit_breakers.needs_reauth if session else False,
+        "circuits": session.circuit_breakers.snapshot() if session else {},
+        "tabs": session_pool.stats() if session_pool else None,
+        "startup": {"seconds": session.startup_seconds, "path": session.startup_path} if session else None,
+        "browser": session.resource_stats() if session else None,
+        "dead_letters": dead_letters.count() if dead_letters else 0,
     })
 
 
@@ -115,7 +321,7 @@ def start_session():
         return jsonify({"error": "Session already connected"}), 400
 
     def run_session():
-        global session, loop, state
+        global session, session_pool, loop, state
 
         try:
             update_state(status="starting", error=None)
@@ -125,22 +331,35 @@ def start_session():
             asyncio.set_event_loop(loop)
 
             async def start():
-                global session
+                global session, session_pool
                 # Always visible (not headless) for auth
-                session = CoStarSession(headless=False)
+                session = CoStarSession(headless=False, **rate_settings, **browser_settings)
                 await session.__aenter__()
+                update_state(browser_pid=session.monitor.pid if session.monitor else None)
+                session_pool = CoStarSessionPool(session, pool_settings["tabs"])
+                await session_pool.open()
 
                 update_state(
                     status="connected",
                     started_at=datetime.now().isoformat(),
                     last_auth=datetime.now().isoformat(),
+                    last_verified=datetime.now().isoformat(),
+                    auth_ok=True,
                     last_activity=datetime.now().isoformat(),
                 )
                 logger.info("CoStar session connected!")
 
-                # Keep the session alive
-                while state.status == "connected":
+                keepalive_task = asyncio.create_task(keepalive()) if keepalive_settings["interval"] else None
+
+                # Hold the loop open (a re-auth in progress keeps it too); the tick doubles as a lag probe
+                while state.status in ("connected", "authenticating"):
+                    tick = time.monotonic()
                     await asyncio.sleep(1)
+                    loop_stats["lag_seconds"] = max(0.0, time.monotonic() - tick - 1)
+                    loop_stats["max_lag_seconds"] = max(loop_stats["max_lag_seconds"], loop_stats["lag_seconds"])
+
+                if keepalive_task:
+                    keepalive_task.cancel()
 
             loop.run_until_complete(start())
 
@@ -148,6 +367,12 @@ def start_session():
             logger.error(f"Session error: {e}")
             update_state(status="error", error=str(e))
         finally:
+            if session_pool:
+                try:
+                    loop.run_until_complete(session_pool.close())
+                except:
+                    pass
+            session_pool = None
             if session:
                 try:
                     loop.run_until_complete(session.__aexit__(None, None, None))
@@ -185,44 +410,14 @@ def stop_session():
 
 @app.route("/auth", methods=["POST"])
 def trigger_auth():
-    """Trigger re-authentication (opens login page)."""
+    """Trigger re-authentication (credential login, then the login page for a manual sign-in)."""
     global session, loop
 
     if state.status != "connected" or not session:
         return jsonify({"error": "Session not connected"}), 400
 
     update_state(status="authenticating")
-
-    def do_auth():
-        try:
-            async def auth():
-                # Navigate to login to trigger re-auth
-                await session.tab.go_to("https://product.costar.com/")
-                logger.info("Navigated to login - please authenticate")
-
-                # Wait for user to complete auth
-                for _ in range(120):  # 2 minutes
-                    await asyncio.sleep(1)
-                    url = await session._get_url()
-                    if any(home in url for home in session.HOME_URLS if hasattr(session, 'HOME_URLS')) or "home" in url.lower():
-                        await session._save_cookies()
-                        update_state(
-                            status="connected",
-                            last_auth=datetime.now().isoformat(),
-                        )
-                        logger.info("Re-authentication successful!")
-                        return
-
-                update_state(status="error", error="Auth timeout")
-
-            loop.call_soon_threadsafe(
-                lambda: asyncio.ensure_future(auth())
-            )
-        except Exception as e:
-            update_state(status="error", error=str(e))
-
-    thread = threading.Thread(target=do_auth, daemon=True)
-    thread.start()
+    asyncio.run_coroutine_threadsafe(reauthenticate(), loop)
 
     return jsonify({"message": "Authentication started - please complete in browser"})
 
@@ -232,11 +427,9 @@ def execute_query():
     """Execute a query using the active session."""
     global session, loop
 
-    if state.status != "connected" or not session:
-        return jsonify({"error": "Session not connected"}), 400
-
-    if not is_session_valid():
-        return jsonify({"error": "Session expired - please re-authenticate"}), 401
+    unavailable = session_unavailable()
+    if unavailable:
+        return unavailable
 
     data = request.json
     query_type = data.get("query_type", "find_sellers")
@@ -248,9 +441,14 @@ def execute_query():
     result = {"error": None, "data": None}
     done_event = threading.Event()
 
+    # Checkpointed find_sellers runs get their ID up front so a timed-out request can resume
+    run_id = None
+    if query_type == "find_sellers" and checkpoints and options.get("checkpoint", True):
+        run_id = options.get("resume") or uuid.uuid4().hex[:12]
+
     async def run_query():
         try:
-            client = CoStarClient(session.tab, rate_limit=1.0)
+            client = await make_client(options)
 
             if query_type == "find_sellers":
                 include_parcel = options.get("include_parcel", False)
@@ -266,6 +464,16 @@ def execute_query():
                     require_email=require_email,
                     include_parcel=include_parcel,
                     concurrency=options.get("concurrency", 3),
+                    batch_size=options.get("batch_size", 1),
+                    concurrent_pages=options.get("concurrent_pages", False),
+                    partition=options.get("partition", False),
+                    adaptive=options.get("adaptive", True),
+                    max_concurrency=options.get("max_concurrency", DEFAULT_MAX),
+                    dead_letters=dead_letters,
+                    checkpoint=checkpoints if run_id else None,
+                    run_id=run_id,
+                    resume=options.get("resume"),
+                    no_contacts_days=options.get("no_contacts_days"),
                 )
 
                 payload_list = [payload] if not isinstance(payload, list) else payload
@@ -277,6 +485,13 @@ def execute_query():
                 result["data"] = {
                     "contacts": contacts,
                     "count": len(contacts),
+                    "concurrency": extractor.controller.snapshot() if extractor.controller else None,
+                    "failed_properties": len(extractor.failed_properties),
+                    "run_id": run_id,
+                    "dedupe": extractor.property_index.stats(),
+                    "owner_cache_hits": extractor.owner_hits,
+                    "no_contacts_skipped": extractor.no_contacts_skipped,
+                    "attribution": extractor.property_index.attribution(),
                 }
 
             elif query_type == "graphql":
@@ -294,7 +509,15 @@ def execute_query():
             elif query_type == "property_search":
                 # Execute property search with payload
                 max_pages = options.get("max_pages", 1)
-                pins = await client.search_properties(payload, max_pages=max_pages)
+                if options.get("partition"):
+                    pins = await PayloadPartitioner(client).search(payload)
+                else:
+                    pins = await client.search_properties(
+                        payload,
+                        max_pages=max_pages,
+                        concurrent=options.get("concurrent_pages", False),
+                        max_rows=options.get("max_properties"),
+                    )
                 result["data"] = {
                     "pins": pins,
                     "count": len(pins),
@@ -316,15 +539,13 @@ def execute_query():
             done_event.set()
 
     # Schedule the query on the session's event loop
-    if loop and loop.is_running():
-        asyncio.run_coroutine_threadsafe(run_query(), loop)
-    else:
+    if not schedule_job(run_query()):
         return jsonify({"error": "Event loop not running"}), 500
 
     # Wait for completion (with timeout)
     timeout = options.get("timeout", 300)  # 5 min default
     if not done_event.wait(timeout):
-        return jsonify({"error": "Query timeout"}), 504
+        return jsonify({"error": "Query timeout", "run_id": run_id}), 504
 
     if result["error"]:
         return jsonify({"error": result["error"]}), 500
@@ -337,11 +558,9 @@ def count_properties():
     """Get property counts for search payloads without fetching all data."""
     global session, loop
 
-    if state.status != "connected" or not session:
-        return jsonify({"error": "Session not connected"}), 400
-
-    if not is_session_valid():
-        return jsonify({"error": "Session expired - please re-authenticate"}), 401
+    unavailable = session_unavailable()
+    if unavailable:
+        return unavailable
 
     data = request.json
     payload = data.get("payload", {})
@@ -353,7 +572,7 @@ def count_properties():
 
     async def run_count():
         try:
-            client = CoStarClient(session.tab, rate_limit=1.0)
+            client = await make_client(data.get("options", {}))
 
             # Handle single payload or list of payloads
             payload_list = [payload] if not isinstance(payload, list) else payload
@@ -386,9 +605,7 @@ def count_properties():
             done_event.set()
 
     # Schedule the count on the session's event loop
-    if loop and loop.is_running():
-        asyncio.run_coroutine_threadsafe(run_count(), loop)
-    else:
+    if not schedule_job(run_count()):
         return jsonify({"error": "Event loop not running"}), 500
 
     # Wait for completion (with timeout)
@@ -413,7 +630,11 @@ def enrich_properties():
             "include_contacts": true,
             "include_parcel": true,
             "include_loans": true,
-            "concurrency": 5
+            "concurrency": 5,
+            "adaptive": true,
+            "max_concurrency": 16,
+            "use_cache": true,
+            "refresh_cache": false
         }
     }
 
@@ -425,11 +646,9 @@ def enrich_properties():
     """
     global session, loop
 
-    if state.status != "connected" or not session:
-        return jsonify({"error": "Session not connected"}), 400
-
-    if not is_session_valid():
-        return jsonify({"error": "Session expired - please re-authenticate"}), 401
+    unavailable = session_unavailable()
+    if unavailable:
+        return unavailable
 
     data = request.json
     property_ids = data.get("property_ids", [])
@@ -445,13 +664,15 @@ def enrich_properties():
 
     async def run_enrich():
         try:
-            client = CoStarClient(session.tab, rate_limit=0.5)
+            client = await make_client(options)
             enricher = PropertyEnricher(
                 client=client,
                 include_contacts=options.get("include_contacts", True),
                 include_parcel=options.get("include_parcel", True),
                 include_loans=options.get("include_loans", True),
                 concurrency=options.get("concurrency", 5),
+                adaptive=options.get("adaptive", True),
+                max_concurrency=options.get("max_concurrency", DEFAULT_MAX),
             )
 
             enriched = await enricher.enrich_properties(property_ids)
@@ -461,6 +682,7 @@ def enrich_properties():
                 "count": len(enriched),
                 "success_count": len([p for p in enriched if not p.get("error")]),
                 "error_count": len([p for p in enriched if p.get("error")]),
+                "concurrency": enricher.controller.snapshot() if enricher.controller else None,
             }
 
             update_state(
@@ -475,9 +697,7 @@ def enrich_properties():
             done_event.set()
 
     # Schedule on the session's event loop
-    if loop and loop.is_running():
-        asyncio.run_coroutine_threadsafe(run_enrich(), loop)
-    else:
+    if not schedule_job(run_enrich()):
         return jsonify({"error": "Event loop not running"}), 500
 
     # Wait for completion (longer timeout for bulk operations)
@@ -491,11 +711,165 @@ def enrich_properties():
     return jsonify(result["data"])
 
 
+@app.route("/retry-failed", methods=["POST"])
+def retry_failed():
+    """Retry dead-lettered properties from earlier find_sellers runs.
+
+    Request body (all optional):
+    {
+        "limit": 500,
+        "options": {"include_parcel": false, "require_email": true}
+    }
+    """
+    global session, loop
+
+    unavailable = session_unavailable()
+    if unavailable:
+        return unavailable
+
+    if not dead_letters:
+        return jsonify({"error": "Dead letter queue not configured"}), 400
+
+    data = request.json or {}
+    options = data.get("options", {})
+
+    result = {"error": None, "data": None}
+    done_event = threading.Event()
+
+    async def run_retry():
+        try:
+            extractor = ContactExtractor(
+                client=await make_client(options),
+                require_email=options.get("require_email", True),
+                include_parcel=options.get("include_parcel", False),
+                concurrency=options.get("concurrency", 3),
+                dead_letters=dead_letters,
+            )
+            contacts = await extractor.retry_dead_letters(data.get("limit"))
+            result["data"] = {
+                "contacts": contacts,
+                "count": len(contacts),
+                "still_failing": dead_letters.count(),
+            }
+            update_state(last_activity=datetime.now().isoformat())
+
+        except Exception as e:
+            logger.error(f"Retry error: {e}")
+            result["error"] = str(e)
+        finally:
+            done_event.set()
+
+    if not schedule_job(run_retry()):
+        return jsonify({"error": "Event loop not running"}), 500
+
+    timeout = options.get("timeout", 600)
+    if not done_event.wait(timeout):
+        return jsonify({"error": "Retry timeout"}), 504
+
+    if result["error"]:
+        return jsonify({"error": result["error"]}), 500
+
+    return jsonify(result["data"])
+
+
+@app.route("/runs", methods=["GET"])
+def list_runs():
+    """Recent checkpointed find_sellers runs and their progress."""
+    if not checkpoints:
+        return jsonify({"error": "Checkpoints not configured"}), 400
+    return jsonify({"runs": checkpoints.runs(request.args.get("limit", 20, type=int))})
+
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """Prometheus text-format metrics for the service and its CoStar clients."""
+    lines = []
+    lines += render_metric("costar_session_connected", "gauge", "1 if the browser session is connected",
+                           [({}, 1 if state.status == "connected" else 0)])
+    lines += render_metric("costar_session_valid", "gauge", "1 if the session is believed authenticated",
+                           [({}, 1 if is_session_valid() else 0)])
+    lines += render_metric("costar_session_cookie_rotations_total", "counter",
+                           "Cookie rotations saved by the keepalive", [({}, state.cookie_rotations)])
+    lines += render_metric("costar_queries_total", "counter", "Queries completed by the service",
+                           [({}, state.queries_run)])
+    with job_lock:
+        lines += render_metric("costar_jobs_in_flight", "gauge", "Jobs running on the session loop",
+                               [({}, job_counts["running"])])
+        lines += render_metric("costar_jobs_queued", "gauge", "Jobs scheduled but not yet started",
+                               [({}, job_counts["queued"])])
+    lines += render_metric("costar_event_loop_lag_seconds", "gauge", "Latest session event-loop lag",
+                           [({}, round(loop_stats["lag_seconds"], 4))])
+    lines += render_metric("costar_event_loop_max_lag_seconds", "gauge", "Worst session event-loop lag seen",
+                           [({}, round(loop_stats["max_lag_seconds"], 4))])
+
+    if session:
+        if session.startup_seconds is not None:
+            lines += render_metric("costar_session_startup_seconds", "gauge",
+                                   "Browser launch to authenticated session, by start path",
+                                   [({"path": session.startup_path}, session.startup_seconds)])
+        resources = session.resource_stats()
+        if resources.get("rss_mb") is not None:
+            lines += render_metric("costar_browser_rss_bytes", "gauge", "Resident memory of Chrome and its children",
+                                   [({}, int(resources["rss_mb"] * 1024 * 1024))])
+            lines += render_metric("costar_browser_peak_rss_bytes", "gauge", "Highest sampled browser resident memory",
+                                   [({}, int(resources["peak_rss_mb"] * 1024 * 1024))])
+        lines += render_metric("costar_browser_navigation_seconds", "gauge", "Latest navigation time by path",
+                               [({"path": path}, seconds) for path, seconds in resources.get("navigation_seconds", {}).items()])
+        lines += render_metric("costar_browser_blocked_requests_total", "counter", "Requests blocked by lean mode",
+                               [({}, resources["blocked_requests"])])
+        limiter = session.rate_limiter.stats()
+        lines += render_metric("costar_rate_limiter_tokens", "gauge", "Tokens left in the shared bucket",
+                               [({}, limiter["tokens"])])
+        lines += render_metric("costar_rate_limiter_wait_seconds_total", "counter",
+                               "Total time requests waited on the shared bucket", [({}, limiter["wait_time"])])
+        lines += render_metric("costar_circuit_open", "gauge", "1 if the endpoint's circuit is not closed",
+                               [({"endpoint": e}, 0 if c["state"] == "closed" else 1)
+                                for e, c in session.circuit_breakers.snapshot().items()])
+
+    if response_cache:
+        cache = response_cache.stats()
+        lines += render_metric("costar_cache_hits_total", "counter", "Response cache hits", [({}, cache["hits"])])
+        lines += render_metric("costar_cache_misses_total", "counter", "Response cache misses", [({}, cache["misses"])])
+
+    lines += client_metrics.render()
+    return "\n".join(lines) + "\n", 200, {"Content-Type": "text/plain; version=0.0.4"}
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(description="CoStar Session Service")
     parser.add_argument("--port", type=int, default=8765, help="Port to run on")
+    parser.add_argument("--rps", type=float, default=DEFAULT_RATE, help="Shared requests/second budget for the tab")
+    parser.add_argument("--burst", type=float, default=DEFAULT_BURST, help="Token bucket burst capacity")
+    parser.add_argument("--cache-path", default=str(DEFAULT_CACHE_PATH), help="SQLite response cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    parser.add_argument("--dead-letter-path", default=str(DEFAULT_DEAD_LETTER_PATH), help="SQLite file for failed properties")
+    parser.add_argument("--checkpoint-path", default=str(DEFAULT_CHECKPOINT_PATH), help="SQLite file for run checkpoints")
+    parser.add_argument("--tabs", type=int, default=DEFAULT_TABS,
+                        help=f"Tabs sharing the login; requests go to the least-loaded one (max {MAX_TABS})")
+    parser.add_argument("--keepalive", type=float, default=KEEPALIVE_SECONDS,
+                        help="Seconds between background auth checks (0 = off)")
+    parser.add_argument("--profile-dir", default=str(DEFAULT_USER_DATA_DIR),
+                        help="Persistent Chrome profile; no other session may use it while the service runs ('' = throwaway)")
+    parser.add_argument("--lean", action="store_true",
+                        help="Block images/fonts/media/third-party hosts and cap browser memory")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=TAB,
+                        help="Default request transport: the browser tab, or direct HTTP with its cookies")
     args = parser.parse_args()
+    if not 1 <= args.tabs <= MAX_TABS:
+        parser.error(f"--tabs must be between 1 and {MAX_TABS}")
+
+    global response_cache, dead_letters, checkpoints
+    rate_settings.update(requests_per_second=args.rps, burst=args.burst)
+    transport_settings["default"] = args.transport
+    pool_settings["tabs"] = args.tabs
+    browser_settings["lean"] = args.lean
+    browser_settings["user_data_dir"] = args.profile_dir or None
+    keepalive_settings["interval"] = args.keepalive
+    if not args.no_cache:
+        response_cache = ResponseCache(args.cache_path)
+    dead_letters = DeadLetterQueue(args.dead_letter_path)
+    checkpoints = CheckpointStore(args.checkpoint_path)
 
     logger.info(f"Starting CoStar Session Service on port {args.port}")
     logger.info("Endpoints:")
@@ -506,6 +880,9 @@ def main():
     logger.info("  POST /query   - Execute a query")
     logger.info("  POST /count   - Get property counts (fast preview)")
     logger.info("  POST /enrich  - Enrich properties with full details")
+    logger.info("  POST /retry-failed - Retry dead-lettered properties")
+    logger.info("  GET  /runs    - Checkpointed runs (resume with options.resume)")
+    logger.info("  GET  /metrics - Prometheus metrics")
 
     app.run(host="0.0.0.0", port=args.port, threaded=True)
 
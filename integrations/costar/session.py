@@ -5,14 +5,22 @@ import json
 import logging
 import os
 import random
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Union
+from urllib.parse import urlparse
 
 from dotenv import load_dotenv
 from pydoll.browser import Chrome
 from pydoll.browser.options import ChromiumOptions
 
+from .circuit import AUTH_STATUSES, CircuitBreakers
+from .client import PROPERTY_COUNT_URL, response_status
+from .lean import LEAN_CHROME_ARGS, RequestBlocker, ResourceMonitor, browser_pid, timed_go_to
+from .ratelimit import DEFAULT_BURST, DEFAULT_RATE, TokenBucket
+from .transport import COSTAR_ORIGIN, HttpTransport
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
@@ -23,16 +31,67 @@ HOME_URLS = [
     "https://product.costar.com/suiteapps/home"
 ]
 LEASECOMPS_URL = "https://product.costar.com/LeaseComps/Search/Index/US"
+# Tiny same-origin document: puts the tab on CoStar's origin (so in-page
+# requests carry its cookies) without loading the SPA
+ORIGIN_URL = "https://product.costar.com/robots.txt"
+
+# Smallest count search; any JSON answer means the cookies were accepted
+AUTH_CHECK_PAYLOAD = {"0": {}, "1": 1, "2": 1}
+
+# Persistent profile the long-lived service opts into. Chrome locks a
+# user-data-dir, so it cannot be shared by two running sessions.
+DEFAULT_USER_DATA_DIR = Path("session") / "chrome-profile"
 
 FORM_TIMEOUT = 10
 QR_TIMEOUT = 60  # 1 minute for QR scan
 COOKIE_MAX_AGE_DAYS = 7
 
 
-class CoStarSession:
-    """Manages CoStar authentication and browser lifecycle."""
+def _redirected(response) -> bool:
+    """True if an API call ended on another page, i.e. CoStar sent it to sign in."""
+    url = getattr(response, "url", None)
+    return bool(url) and urlparse(url).path != urlparse(PROPERTY_COUNT_URL).path
+
 
-    def __init__(self, headless: bool = True):
+class CoStarSession:
+    """Manages CoStar authentication and browser lifecycle.
+
+    `rate_limiter` is shared by every CoStarClient created on this session's
+    tab, so concurrent jobs cannot exceed `requests_per_second` in aggregate.
+    `circuit_breakers` likewise track endpoint health for all those clients.
+    `http_transport()` hands out a direct HTTP transport carrying this
+    session's cookies, so the browser is only needed for login and refresh.
+
+    With a `user_data_dir` Chrome runs on a persistent profile, so its
+    cookies survive between runs. Chrome locks the directory: only one
+    running session (in any process) can use it, and a second one fails to
+    launch. The default (None) is a throwaway profile, so one-off runs can
+    overlap with the service, which opts into DEFAULT_USER_DATA_DIR. With
+    `warm_start`, startup is one page-less auth check (a count API call,
+    using the profile's or the saved cookie file's cookies) instead of the
+    home and LeaseComps navigations; the cookie-file restore and login only
+    run if that check fails. `startup_seconds` and `startup_path` record
+    how the last start went.
+
+    `lean` blocks images, fonts, media, styles and non-CoStar hosts on the
+    session's tabs (except while the login page renders) and launches
+    Chrome with memory-capping flags. `resource_stats()` reports browser
+    RSS (with psutil), its peak, and navigation times in either mode.
+
+    `ready` is set while the session is authenticated; whoever re-auths
+    clears it, and clients built with `ready=session.ready` hold their
+    requests until it is set again.
+    """
+
+    def __init__(
+        self,
+        headless: bool = True,
+        requests_per_second: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        user_data_dir: Optional[Union[str, Path]] = None,
+        warm_start: bool = True,
+        lean: bool = False,
+    ):
         self.username = os.getenv('COSTAR_USERNAME')
         self.password = os.getenv('COSTAR_PW')
 
@@ -40,67 +99,171 @@ class CoStarSession:
             raise ValueError("COSTAR_USERNAME and COSTAR_PW environment variables required")
 
         self.headless = headless
+        self.user_data_dir = Path(user_data_dir) if user_data_dir else None
+        self.warm_start = warm_start
+        self.lean = lean
+        self.monitor: Optional[ResourceMonitor] = None
+        self.startup_seconds: Optional[float] = None
+        self.startup_path: Optional[str] = None  # warm, cookies or login
         self.browser: Optional[Chrome] = None
         self.tab = None
+        self.rate_limiter = TokenBucket(rate=requests_per_second, capacity=burst)
+        self.circuit_breakers = CircuitBreakers()
         self._cookie_file = Path("session") / "costar_cookies.json"
+        self._http_transport: Optional[HttpTransport] = None
+        self._blockers: List[RequestBlocker] = []
+        self._saved_cookies_key: Optional[tuple] = None
+        self.ready = asyncio.Event()
 
     async def __aenter__(self):
+        started = time.monotonic()
         self._cookie_file.parent.mkdir(exist_ok=True)
 
         options = ChromiumOptions()
         if self.headless:
             options.add_argument("--headless=new")
+        if self.user_data_dir:
+            self.user_data_dir.mkdir(parents=True, exist_ok=True)
+            options.add_argument(f"--user-data-dir={self.user_data_dir.resolve()}")
+        if self.lean:
+            for argument in LEAN_CHROME_ARGS:
+                options.add_argument(argument)
 
         self.browser = Chrome(options=options)
         await self.browser.__aenter__()
         self.tab = await self.browser.start()
-
-        if not await self._try_cookies() and not await self._login():
+        self.monitor = ResourceMonitor(browser_pid(self.browser))
+        self.monitor.start()
+        await self.prepare_tab(self.tab)
+
+        if self.warm_start and await self._try_warm_start():
+            self.startup_path = "warm"
+        elif await self._try_cookies():
+            self.startup_path = "cookies"
+        elif await self._login():
+            self.startup_path = "login"
+        else:
             raise Exception("CoStar authentication failed")
 
+        self.startup_seconds = round(time.monotonic() - started, 2)
+        logger.info(f"Session ready in {self.startup_seconds}s ({self.startup_path} start)")
+        self.ready.set()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.monitor:
+            await self.monitor.stop()
+        if self._http_transport:
+            await self._http_transport.close()
+            self._http_transport = None
         if self.browser:
             await self.browser.__aexit__(exc_type, exc_val, exc_tb)
 
-    async def _try_cookies(self) -> bool:
-        if not self._cookie_file.exists():
+    async def prepare_tab(self, tab):
+        """Install lean-mode request blocking on a tab (no-op unless lean)."""
+        if not self.lean:
+            return
+        blocker = RequestBlocker(tab)
+        blocker.enabled = self.blocking
+        await blocker.install()
+        self._blockers.append(blocker)
+
+    @property
+    def blocking(self) -> bool:
+        return all(b.enabled for b in self._blockers)
+
+    @blocking.setter
+    def blocking(self, enabled: bool):
+        """Switch lean blocking on every tab, e.g. off while the login page must render."""
+        for blocker in self._blockers:
+            blocker.enabled = enabled
+
+    def resource_stats(self) -> dict:
+        return {
+            **(self.monitor.stats() if self.monitor else {}),
+            "lean": self.lean,
+            "blocked_requests": sum(b.blocked for b in self._blockers),
+        }
+
+    async def check_auth(self) -> Optional[bool]:
+        """One cheap authenticated API call.
+
+        True if CoStar answered with JSON, False if it rejected the session's
+        cookies (401/403 or a redirect to sign in), None if the answer says
+        neither (no response, a 5xx or maintenance page) and the check should
+        be repeated.
+        """
+        response = await self.tab.request.post(PROPERTY_COUNT_URL, json=AUTH_CHECK_PAYLOAD)
+        status = response_status(response)
+        if status is None or status >= 500:
+            return None
+        if status in AUTH_STATUSES or 300 <= status < 400 or _redirected(response):
             return False
+        try:
+            response.json()
+        except ValueError:
+            return None
+        return True
 
+    async def _try_warm_start(self) -> bool:
+        """Validate the profile's (plus any saved) cookies without loading CoStar pages."""
         try:
-            with open(self._cookie_file) as f:
-                data = json.load(f)
+            cookies = self._saved_cookies()
+            if cookies:
+                await self.browser.set_cookies(cookies)
 
-            if data.get('username') != self.username:
-                logger.info("Cookie username mismatch")
+            await timed_go_to(self.tab, ORIGIN_URL, self.monitor)
+            if not await self.check_auth():
+                logger.info("Warm start: cookies not confirmed, falling back to page validation")
                 return False
 
-            saved_at = datetime.fromisoformat(data['saved_at'])
-            if datetime.now() - saved_at > timedelta(days=COOKIE_MAX_AGE_DAYS):
-                logger.info("Cookies expired")
-                return False
+            logger.info("Session restored without navigation")
+            return True
 
-            from pydoll.protocol.network.types import CookieParam
-            now = datetime.now().timestamp()
-            cookies = [
-                CookieParam(
-                    name=c['name'],
-                    value=c['value'],
-                    domain=c.get('domain'),
-                    path=c.get('path', '/'),
-                    secure=c.get('secure', False),
-                    httpOnly=c.get('httpOnly', False)
-                )
-                for c in data['cookies']
-                if c.get('expires', -1) == -1 or c['expires'] >= now
-            ]
+        except Exception as e:
+            logger.warning(f"Warm start failed: {e}")
+            return False
 
+    def _saved_cookies(self) -> Optional[List]:
+        """Unexpired cookies from the cookie file, or None if it is missing, stale or another user's."""
+        if not self._cookie_file.exists():
+            return None
+
+        with open(self._cookie_file) as f:
+            data = json.load(f)
+
+        if data.get('username') != self.username:
+            logger.info("Cookie username mismatch")
+            return None
+
+        saved_at = datetime.fromisoformat(data['saved_at'])
+        if datetime.now() - saved_at > timedelta(days=COOKIE_MAX_AGE_DAYS):
+            logger.info("Cookies expired")
+            return None
+
+        from pydoll.protocol.network.types import CookieParam
+        now = datetime.now().timestamp()
+        return [
+            CookieParam(
+                name=c['name'],
+                value=c['value'],
+                domain=c.get('domain'),
+                path=c.get('path', '/'),
+                secure=c.get('secure', False),
+                httpOnly=c.get('httpOnly', False)
+            )
+            for c in data['cookies']
+            if c.get('expires', -1) == -1 or c['expires'] >= now
+        ]
+
+    async def _try_cookies(self) -> bool:
+        try:
+            cookies = self._saved_cookies()
             if not cookies:
                 return False
 
             await self.browser.set_cookies(cookies)
-            await self.tab.go_to(HOME_URLS[0])
+            await timed_go_to(self.tab, HOME_URLS[0], self.monitor)
             await asyncio.sleep(3)
 
             url = await self._get_url()
@@ -119,9 +282,11 @@ class CoStarSession:
             return False
 
     async def _login(self) -> bool:
+        # The login form and QR code need their images and identity-provider hosts
+        self.blocking = False
         try:
             logger.info("Starting fresh login...")
-            await self.tab.go_to(LOGIN_URL)
+            await timed_go_to(self.tab, LOGIN_URL, self.monitor)
 
             form = await self.tab.find(id="signinform", timeout=FORM_TIMEOUT)
             if not form:
@@ -142,7 +307,7 @@ class CoStarSession:
                 url = await self._get_url()
                 if any(home in url for home in HOME_URLS):
                     logger.info("Login successful!")
-                    await self._save_cookies()
+                    await self.sync_cookies()
                     await self._navigate_to_leasecomps()
                     return True
                 if elapsed > 0 and elapsed % 30 == 0:
@@ -154,6 +319,8 @@ class CoStarSession:
         except Exception as e:
             logger.error(f"Login failed: {e}")
             return False
+        finally:
+            self.blocking = True
 
     async def _fill_field(self, field_id: str, value: str):
         field = await self.tab.find(id=field_id, timeout=5)
@@ -178,11 +345,35 @@ class CoStarSession:
 
     async def _navigate_to_leasecomps(self):
         logger.info("Navigating to LeaseComps...")
-        await self.tab.go_to(LEASECOMPS_URL)
+        await timed_go_to(self.tab, LEASECOMPS_URL, self.monitor)
         await asyncio.sleep(random.uniform(2, 4))
 
+    async def http_transport(self) -> HttpTransport:
+        """Shared direct HTTP transport, re-synced with the browser's current cookies.
+
+        Call again after re-authenticating; the existing transport (and its
+        connection pool) is kept and only its cookies are replaced.
+        """
+        cookies = [c for c in await self.browser.get_cookies() if isinstance(c, dict)]
+        if self._http_transport:
+            self._http_transport.update_cookies(cookies)
+            return self._http_transport
+
+        headers = {
+            "User-Agent": await self._script_value("return navigator.userAgent;"),
+            "Accept": "application/json, text/plain, */*",
+            "Origin": COSTAR_ORIGIN,
+            "Referer": LEASECOMPS_URL,
+        }
+        self._http_transport = HttpTransport(cookies, headers=headers)
+        logger.info(f"HTTP transport ready with {len(cookies)} cookies (http2={self._http_transport.http2})")
+        return self._http_transport
+
     async def _get_url(self) -> str:
-        result = await self.tab.execute_script("return window.location.href;")
+        return await self._script_value("return window.location.href;")
+
+    async def _script_value(self, script: str) -> str:
+        result = await self.tab.execute_script(script)
         if isinstance(result, dict):
             nested = result.get('result', {})
             if isinstance(nested, dict) and 'result' in nested:
@@ -190,6 +381,29 @@ class CoStarSession:
             return str(nested)
         return str(result)
 
+    @staticmethod
+    def _cookies_key(cookies: List) -> tuple:
+        return tuple(sorted(
+            (c.get('domain'), c.get('path'), c.get('name'), c.get('value'))
+            for c in cookies if isinstance(c, dict)
+        ))
+
+    async def sync_cookies(self) -> bool:
+        """Save cookies (and hand them to the HTTP transport) if they changed since the last save.
+
+        Returns True when that means CoStar rotated them; the first save of a
+        warm-started session is not a rotation.
+        """
+        cookies = await self.browser.get_cookies()
+        if self._cookies_key(cookies) == self._saved_cookies_key:
+            return False
+
+        rotated = self._saved_cookies_key is not None
+        await self._save_cookies()
+        if self._http_transport:
+            self._http_transport.update_cookies([c for c in cookies if isinstance(c, dict)])
+        return rotated
+
     async def _save_cookies(self):
         try:
             cookies = await self.browser.get_cookies()
@@ -214,6 +428,7 @@ class CoStarSession:
 
             with open(self._cookie_file, 'w') as f:
                 json.dump(data, f, indent=2, default=str)
+            self._saved_cookies_key = self._cookies_key(cookies)
 
             logger.info(f"Saved {len(cookie_list)} cookies")
         except Exception as e:
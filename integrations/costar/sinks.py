@@ -0,0 +1,99 @@
+"""CoStar Contact Sinks - Destinations for contacts streamed out of an extraction.
+
+A sink receives each contact as soon as its property finishes, so results
+are usable (and survive a crash) before the run ends:
+
+    async for contact in extractor.iter_contacts(payloads):
+        await sink.write(contact)
+    await sink.close()
+"""
+
+import abc
+import asyncio
+import inspect
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TextIO, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class ContactSink(abc.ABC):
+    """Base sink: subclasses implement `write`; `flush`/`close` are optional."""
+
+    def __init__(self):
+        self.written = 0
+
+    @abc.abstractmethod
+    async def write(self, contact: Dict[str, Any]):
+        """Deliver one contact."""
+
+    async def flush(self):
+        pass
+
+    async def close(self):
+        await self.flush()
+
+
+class NDJSONSink(ContactSink):
+    """One JSON object per line to a text stream (stdout by default)."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+
+    async def write(self, contact: Dict[str, Any]):
+        self.stream.write(json.dumps(contact, default=str) + "\n")
+        self.stream.flush()
+        self.written += 1
+
+
+class FileSink(NDJSONSink):
+    """NDJSON appended to a file, flushed per contact so a crash loses nothing."""
+
+    def __init__(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        super().__init__(open(path, "a", encoding="utf-8"))
+
+    async def close(self):
+        await super().close()
+        self.stream.close()
+
+
+class BatchSink(ContactSink):
+    """Buffers contacts and hands them to `callback` in batches, e.g. a DB upsert.
+
+    `callback` may be sync or async. Sync callbacks run in a worker thread
+    so a slow database write doesn't stall the extraction's event loop.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[List[Dict[str, Any]]], Union[None, Awaitable[None]]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        super().__init__()
+        self.callback = callback
+        self.batch_size = batch_size
+        self._buffer: List[Dict[str, Any]] = []
+
+    async def write(self, contact: Dict[str, Any]):
+        self._buffer.append(contact)
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        if inspect.iscoroutinefunction(self.callback):
+            await self.callback(batch)
+        else:
+            await asyncio.to_thread(self.callback, batch)
+        self.written += len(batch)
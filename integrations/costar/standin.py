@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+CoStar Stand-in Server - Local fake of the CoStar endpoints the client uses.
+
+Serves deterministic synthetic data with injectable latency, 429s and
+failures so CoStarClient, ContactExtractor and PropertyEnricher can be
+benchmarked and load-tested without a browser or a CoStar login.
+
+Usage:
+    python integrations/costar/standin.py [--port 8766] [--properties 50000]
+
+    from integrations.costar.standin import StandInTab
+    client = CoStarClient(StandInTab("http://127.0.0.1:8766"))
+
+Endpoints (same paths as product.costar.com):
+    POST /graphql                                - ContactsDetail(+Batch), parcelPinsFromProperty, Parcel_Info
+    POST /bff2/property/search/list-properties   - Paged search results
+    POST /bff2/property/search/count             - Search counts
+    GET  /pds/properties/<id>                    - Property details
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Flask, jsonify, request
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from integrations.costar.client import PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+COSTAR_ORIGIN = "https://product.costar.com"
+ADAPTER_THREADS = 64  # Blocking urllib calls in flight across all stand-in tabs
+OWNER_POOL = 0.15  # Owners per property; lower = bigger portfolios
+
+
+@dataclass
+class StandInProfile:
+    """Scale, latency and failure settings for the stand-in server."""
+
+    properties: int = 20000  # Max properties any one payload can match
+    seed: int = 7
+    latency_median: float = 0.25  # Seconds, lognormal
+    latency_sigma: float = 0.5
+    search_latency_median: float = 1.5  # list-properties is much slower per call
+    rate_429: float = 0.0  # Probability of a 429 per request
+    error_rate: float = 0.0  # Probability of a 500 per request
+    max_concurrent: int = 0  # Above this many in-flight requests, answer 429 (0 = off)
+    contact_rate: float = 0.6  # Share of properties with a true owner that has contacts
+    email_rate: float = 0.7  # Share of contacts with an email
+
+
+def _rng(*parts: Any) -> random.Random:
+    """Deterministic RNG per entity, so the same ID always yields the same data."""
+    digest = hashlib.sha256(":".join(str(p) for p in parts).encode()).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _payload_seed(payload: Dict) -> str:
+    filters = json.dumps(payload.get("0", {}), sort_keys=True)
+    return hashlib.sha256(filters.encode()).hexdigest()[:12]
+
+
+class StandInData:
+    """Synthetic CoStar data derived from a profile and entity IDs."""
+
+    def __init__(self, profile: StandInProfile):
+        self.profile = profile
+        self.owner_count = max(1, int(profile.properties * OWNER_POOL))
+
+    def match_count(self, payload: Dict) -> int:
+        rng = _rng(self.profile.seed, "count", _payload_seed(payload))
+        return rng.randint(self.profile.properties // 4, self.profile.properties)
+
+    def property_ids(self, payload: Dict) -> List[int]:
+        rng = _rng(self.profile.seed, "ids", _payload_seed(payload))
+        # Overlapping ID ranges so different payloads share some properties
+        start = 100000 + rng.randint(0, self.profile.properties)
+        return [start + i for i in range(self.match_count(payload))]
+
+    def owner_id(self, property_id: int) -> int:
+        return 500000 + _rng(self.profile.seed, "owner", property_id).randrange(self.owner_count)
+
+    def parcel_id(self, property_id: int) -> str:
+        # Pairs of neighbouring properties share a parcel
+        return f"PCL-{property_id // 2}"
+
+    def search_row(self, property_id: int) -> Dict:
+        rng = _rng(self.profile.seed, "row", property_id)
+        owner_id = self.owner_id(property_id)
+        return {
+            "PropertyId": property_id,
+            "PropertyType": rng.choice(["Industrial", "Office", "Retail", "Multi-Family"]),
+            "PropertyTypeId": rng.choice([5, 6, 7, 11]),
+            "Address": f"{property_id % 9000 + 100} Industry Way",
+            "BuildingAreaTotal": rng.randint(5000, 400000),
+            "YearBuilt": rng.randint(1950, 2022),
+            "City": rng.choice(["Irvine", "Anaheim", "Ontario", "Riverside"]),
+            "StateCode": "CA",
+            "PostalCode": f"9{rng.randint(1000, 2999)}",
+            "BuildingClass": rng.choice(["A", "B", "C"]),
+            "StarRating": rng.randint(1, 5),
+            "LastSaleDate": f"{rng.randint(2000, 2023)}-0{rng.randint(1, 9)}-15",
+            "TrueOwner": [{"id": owner_id, "name": f"Owner {owner_id} LLC", "key": f"K{owner_id}", "type": "Company"}],
+        }
+
+    def true_owner(self, property_id: int) -> Optional[Dict]:
+        owner_id = self.owner_id(property_id)
+        rng = _rng(self.profile.seed, "owner-contacts", owner_id)
+        if rng.random() > self.profile.contact_rate:
+            return None
+
+        contacts = []
+        for n in range(rng.randint(1, 6)):
+            person_id = owner_id * 10 + n
+            contacts.append({
+                "personId": person_id,
+                "name": f"Person {person_id}",
+                "title": rng.choice(["Principal", "Managing Partner", "Asset Manager", None]),
+                "email": f"person{person_id}@owner{owner_id}.com" if rng.random() < self.profile.email_rate else None,
+                "phoneNumbers": [f"(949) 555-{rng.randint(1000, 9999)}"],
+            })
+
+        return {
+            "companyId": owner_id,
+            "name": f"Owner {owner_id} LLC",
+            "address": f"{rng.randint(1, 9999)} Main St, Irvine, CA",
+            "phoneNumbers": [f"(714) 555-{rng.randint(1000, 9999)}"],
+            "contacts": contacts,
+        }
+
+    def contacts_detail(self, property_id: int) -> Dict:
+        row = self.search_row(property_id)
+        return {
+            "propertyDetailHeader": {
+                "propertyId": property_id,
+                "addressHeader": f"{property_id % 9000 + 100} Industry Way, {row['City']}, CA",
+                "propertyType": row["PropertyType"],
+                "buildingSize": f"{row['BuildingAreaTotal']:,} SF",
+                "landSize": None,
+                "yearBuilt": str(row["YearBuilt"]),
+            },
+            "propertyContactDetails_info": {"trueOwner": self.true_owner(property_id)},
+        }
+
+    def parcel_detail(self, parcel_id: str) -> Dict:
+        rng = _rng(self.profile.seed, "parcel", parcel_id)
+        price = rng.randint(1, 60) * 250000
+        return {
+            "parcelDetail": {"apn": f"{rng.randint(100, 999)}-{rng.randint(100, 999)}-{rng.randint(10, 99)}",
+                             "lotSizeSf": rng.randint(10000, 900000), "zoning": rng.choice(["M1", "M2", "C2"])},
+            "parcelSales": {"sales": [{
+                "saleDate": f"{rng.randint(2005, 2023)}-06-30",
+                "salePriceTotal": price,
+                "seller": f"Seller {rng.randint(1, 5000)} LP",
+                "ltv": round(rng.uniform(0.4, 0.8), 2),
+                "loans": [{
+                    "lender": rng.choice(["Wells Fargo", "Chase", "US Bank", "Pacific Western"]),
+                    "mortgageAmount": int(price * 0.65),
+                    "intRate": round(rng.uniform(3, 7.5), 2),
+                    "mortgageTerm": rng.choice([60, 84, 120, 360]),
+                    "originationDate": f"{rng.randint(2005, 2023)}-07-01",
+                }],
+            }]},
+        }
+
+    def pds(self, property_id: int) -> Dict:
+        row = self.search_row(property_id)
+        return {
+            "PropertyId": property_id,
+            "Name": None,
+            "Type": row["PropertyType"],
+            "PropertyTypeId": row["PropertyTypeId"],
+            "Location": {
+                "DeliveryAddress": {"DeliveryAddress": f"{property_id % 9000 + 100} Industry Way",
+                                    "CityName": row["City"], "SubdivisionCode": "CA", "PostalCode": row["PostalCode"]},
+                "Location": {"Latitude": 33.6, "Longitude": -117.8},
+                "MarketId": 130,
+                "Market": "Orange County - CA",
+            },
+            "Building": {"BuildingArea": {"Raw": row["BuildingAreaTotal"]}, "BuildingClass": row["BuildingClass"],
+                         "YearBuilt": row["YearBuilt"]},
+            "Land": {"Parcel": self.parcel_id(property_id)},
+        }
+
+
+def create_app(profile: StandInProfile) -> Flask:
+    """Build the stand-in Flask app for a profile."""
+    app = Flask(__name__)
+    data = StandInData(profile)
+    in_flight = {"count": 0}
+    lock = threading.Lock()
+    stats = {"requests": 0, "throttled": 0, "errors": 0}
+
+    def simulate(median: float) -> Optional[Tuple[Any, int]]:
+        """Sleep for a sampled latency; return an error response to inject, if any."""
+        with lock:
+            stats["requests"] += 1
+            busy = profile.max_concurrent and in_flight["count"] > profile.max_concurrent
+
+        time.sleep(random.lognormvariate(0, profile.latency_sigma) * median)
+
+        roll = random.random()
+        if busy or roll < profile.rate_429:
+            stats["throttled"] += 1
+            return jsonify({"error": "Too Many Requests"}), 429
+        if roll < profile.rate_429 + profile.error_rate:
+            stats["errors"] += 1
+            return jsonify({"error": "Internal Server Error"}), 500
+        return None
+
+    @app.before_request
+    def enter():
+        with lock:
+            in_flight["count"] += 1
+
+    @app.teardown_request
+    def leave(exc):
+        with lock:
+            in_flight["count"] -= 1
+
+    @app.route("/graphql", methods=["POST"])
+    def graphql():
+        failure = simulate(profile.latency_median)
+        if failure:
+            return failure
+
+        body = request.get_json(force=True) or {}
+        query = body.get("query", "")
+        variables = body.get("variables") or {}
+
+        if "ContactsDetailBatch" in query:
+            # Aliased batch: p<id>: propertyDetail { ... } with $p<id> variables
+            aliases = re.findall(r"(\w+): propertyDetail", query)
+            return jsonify({"data": {alias: data.contacts_detail(int(variables[alias])) for alias in aliases}})
+        if "ContactsDetail" in query:
+            return jsonify({"data": {"propertyDetail": data.contacts_detail(int(variables["propertyId"]))}})
+        if "parcelPinsFromProperty" in query:
+            parcel_id = data.parcel_id(int(variables["propertyId"]))
+            return jsonify({"data": {"parcelPinsFromProperty": {"parcelPins": [{"id": parcel_id}]}}})
+        if "Parcel_Info" in query:
+            return jsonify({"data": {"publicRecordDetailNew": data.parcel_detail(variables["parcelId"])}})
+
+        return jsonify({"errors": [{"message": "Unknown query for stand-in"}]}), 400
+
+    @app.route("/bff2/property/search/list-properties", methods=["POST"])
+    def list_properties():
+        failure = simulate(profile.search_latency_median)
+        if failure:
+            return failure
+
+        payload = request.get_json(force=True) or {}
+        page = int(payload.get("2") or 1)
+        ids = data.property_ids(payload)[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        return jsonify({"properties": [data.search_row(pid) for pid in ids]})
+
+    @app.route("/bff2/property/search/count", methods=["POST"])
+    def count():
+        failure = simulate(profile.latency_median)
+        if failure:
+            return failure
+
+        payload = request.get_json(force=True) or {}
+        total = data.match_count(payload)
+        return jsonify({"PropertyCount": total, "UnitCount": 0, "ShoppingCenterCount": 0, "SpaceCount": 0})
+
+    @app.route("/pds/properties/<int:property_id>", methods=["GET"])
+    def property_details(property_id: int):
+        failure = simulate(profile.latency_median)
+        if failure:
+            return failure
+        return jsonify(data.pds(property_id))
+
+    @app.route("/_stats", methods=["GET"])
+    def get_stats():
+        return jsonify({**stats, "in_flight": in_flight["count"]})
+
+    return app
+
+
+def serve_in_thread(profile: StandInProfile, port: int = 0) -> Tuple[Any, str]:
+    """Start the stand-in on a background thread. Returns (server, base_url)."""
+    from werkzeug.serving import make_server
+
+    server = make_server("127.0.0.1", port, create_app(profile), threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+class StandInResponse:
+    """Minimal response object with the attributes CoStarClient reads."""
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.ok = 200 <= status_code < 300
+        self.content = content
+
+    def json(self) -> Any:
+        return json.loads(self.content or b"null")
+
+
+_adapter_pool = ThreadPoolExecutor(max_workers=ADAPTER_THREADS, thread_name_prefix="standin-tab")
+
+
+class _StandInRequests:
+    def __init__(self, base_url: str, max_in_flight: int = 0):
+        self.base_url = base_url.rstrip("/")
+        self._slots = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+
+    def _url(self, url: str) -> str:
+        return url.replace(COSTAR_ORIGIN, self.base_url)
+
+    def _send(self, method: str, url: str, body: Optional[bytes], timeout: float) -> StandInResponse:
+        req = urllib.request.Request(
+            self._url(url),
+            data=body,
+            method=method,
+            headers={"Content-Type": "application/json"} if body is not None else {},
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                return StandInResponse(resp.status, resp.read())
+        except urllib.error.HTTPError as e:
+            return StandInResponse(e.code, e.read())
+
+    async def _call(self, method: str, url: str, body: Optional[bytes], timeout: float) -> StandInResponse:
+        # Own pool: the default executor (cpu_count + 4 threads) would cap the stand-in, not the client
+        loop = asyncio.get_running_loop()
+        if not self._slots:
+            return await loop.run_in_executor(_adapter_pool, self._send, method, url, body, timeout)
+        async with self._slots:
+            return await loop.run_in_executor(_adapter_pool, self._send, method, url, body, timeout)
+
+    async def post(self, url: str, json: Optional[Dict] = None, timeout: float = 30):
+        body = globals()["json"].dumps(json or {}).encode()
+        return await self._call("POST", url, body, timeout)
+
+    async def get(self, url: str, timeout: float = 30):
+        return await self._call("GET", url, None, timeout)
+
+
+class StandInTab:
+    """Drop-in for a Pydoll tab: `CoStarClient(StandInTab(url))` talks to the stand-in.
+
+    `max_in_flight` caps concurrent requests on this tab, modelling one
+    renderer's DevTools channel (0 = unlimited).
+    """
+
+    def __init__(self, base_url: str, max_in_flight: int = 0):
+        self.base_url = base_url
+        self.request = _StandInRequests(base_url, max_in_flight)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="CoStar stand-in server")
+    parser.add_argument("--port", type=int, default=8766, help="Port to run on")
+    parser.add_argument("--properties", type=int, default=20000, help="Max properties per payload")
+    parser.add_argument("--seed", type=int, default=7, help="Data seed")
+    parser.add_argument("--latency", type=float, default=0.25, help="Median request latency (s)")
+    parser.add_argument("--search-latency", type=float, default=1.5, help="Median list-properties latency (s)")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Lognormal latency spread")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probability of a 429 per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500 per request")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="429 above this many in-flight requests")
+    args = parser.parse_args()
+
+    profile = StandInProfile(
+        properties=args.properties,
+        seed=args.seed,
+        latency_median=args.latency,
+        latency_sigma=args.sigma,
+        search_latency_median=args.search_latency,
+        rate_429=args.rate_429,
+        error_rate=args.error_rate,
+        max_concurrent=args.max_concurrent,
+    )
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s", datefmt="%H:%M:%S")
+    logger.info(f"CoStar stand-in on port {args.port}: {profile}")
+    create_app(profile).run(host="127.0.0.1", port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""CoStar HTTP Transport - Direct async requests with the browser session's cookies.
+
+The tab transport sends every request through Chrome's DevTools channel, so
+throughput is tied to one renderer. HttpTransport lifts the session cookies
+and browser headers after login and sends requests from a pooled httpx client
+(keep-alive, HTTP/2 when `h2` is installed). The browser is then only needed
+for login and cookie refresh:
+
+    transport = await session.http_transport()
+    client = CoStarClient(session.tab, transport=transport, limiter=session.rate_limiter)
+"""
+
+import importlib.util
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+try:
+    import httpx
+except ImportError:  # Optional: only needed for transport="http"
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+COSTAR_ORIGIN = "https://product.costar.com"
+MAX_CONNECTIONS = 20
+KEEPALIVE_EXPIRY = 30.0  # Seconds an idle pooled connection is kept open
+
+TAB = "tab"
+HTTP = "http"
+TRANSPORTS = (TAB, HTTP)
+
+
+class HttpResponse:
+    """Response with the attributes CoStarClient reads from a tab response."""
+
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.ok = 200 <= status_code < 300
+        self.content = content
+
+    def json(self) -> Any:
+        return json.loads(self.content or b"null")
+
+
+class _HttpRequests:
+    def __init__(self, transport: "HttpTransport"):
+        self.transport = transport
+
+    async def post(self, url: str, json: Optional[Dict] = None, timeout: float = 30):
+        return await self.transport.send("POST", url, json=json, timeout=timeout)
+
+    async def get(self, url: str, timeout: float = 30):
+        return await self.transport.send("GET", url, timeout=timeout)
+
+
+class HttpTransport:
+    """Pooled async HTTP client authenticated with cookies taken from the browser.
+
+    Exposes the same `.request.get/post` surface as a Pydoll tab, so it can
+    stand in for one anywhere a client expects a tab. `origin` redirects
+    product.costar.com requests elsewhere (e.g. the local stand-in).
+    Call `update_cookies` after the browser re-authenticates.
+    """
+
+    def __init__(
+        self,
+        cookies: List[Dict],
+        headers: Optional[Dict[str, str]] = None,
+        http2: bool = True,
+        max_connections: int = MAX_CONNECTIONS,
+        origin: Optional[str] = None,
+    ):
+        if httpx is None:
+            raise ImportError("The HTTP transport needs httpx: pip install 'httpx[http2]'")
+
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("h2 is not installed; HTTP transport falls back to HTTP/1.1 keep-alive")
+            http2 = False
+
+        self.origin = origin.rstrip("/") if origin else None
+        self.http2 = http2
+        self.requests_sent = 0
+        self.request = _HttpRequests(self)
+        self._client = httpx.AsyncClient(
+            http2=http2,
+            headers=headers or {},
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            follow_redirects=False,
+        )
+        self.update_cookies(cookies)
+
+    def update_cookies(self, cookies: List[Dict]):
+        """Replace the jar with the browser's current cookies (CDP cookie dicts)."""
+        jar = httpx.Cookies()
+        for c in cookies:
+            if c.get("name") and c.get("value") is not None:
+                jar.set(c["name"], c["value"], domain=c.get("domain") or "", path=c.get("path") or "/")
+        self._client.cookies = jar
+        logger.debug(f"HTTP transport loaded {len(jar)} cookies")
+
+    def _url(self, url: str) -> str:
+        return url.replace(COSTAR_ORIGIN, self.origin) if self.origin else url
+
+    async def send(self, method: str, url: str, json: Optional[Dict] = None, timeout: float = 30) -> HttpResponse:
+        response = await self._client.request(method, self._url(url), json=json, timeout=timeout)
+        self.requests_sent += 1
+        return HttpResponse(response.status_code, response.content)
+
+    def stats(self) -> Dict:
+        return {"http2": self.http2, "requests": self.requests_sent, "cookies": len(self._client.cookies)}
+
+    async def close(self):
+        await self._client.aclose()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark CoStar contact extraction against the local stand-in server.
+
+Starts the stand-in in-process, runs ContactExtractor over one synthetic
+payload and reports throughput, so client changes can be compared against
+a fixed baseline without a browser session.
+
+Usage:
+    python scripts/costar/bench_standin.py [--properties 2000] [--batch-size 10] [--adaptive] [--tabs 4 --tab-in-flight 4]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from integrations.costar.client import CoStarClient
+from integrations.costar.extract import ContactExtractor
+from integrations.costar.metrics import ClientMetrics
+from integrations.costar.pool import TabDispatcher
+from integrations.costar.ratelimit import TokenBucket
+from integrations.costar.standin import StandInProfile, StandInTab, serve_in_thread
+from integrations.costar.transport import HTTP, TAB, TRANSPORTS, HttpTransport
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+    datefmt="%H:%M:%S",
+)
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+logger = logging.getLogger(__name__)
+
+BENCH_PAYLOAD = {"0": {"Geography": {"Filter": {"Ids": [130], "FilterType": 132}}}, "1": 100, "2": 1}
+
+
+async def run_bench(args) -> dict:
+    profile = StandInProfile(
+        properties=args.properties,
+        latency_median=args.latency,
+        search_latency_median=args.search_latency,
+        rate_429=args.rate_429,
+        error_rate=args.error_rate,
+        max_concurrent=args.max_concurrent,
+    )
+    server, base_url = serve_in_thread(profile)
+    metrics = ClientMetrics()
+    # The stand-in ignores cookies, so the HTTP transport runs with an empty jar
+    transport = HttpTransport([], origin=base_url) if args.transport == HTTP else None
+
+    tabs = [StandInTab(base_url, max_in_flight=args.tab_in_flight) for _ in range(args.tabs)]
+    dispatcher = TabDispatcher(tabs) if args.tabs > 1 else None
+
+    try:
+        client = CoStarClient(
+            dispatcher or tabs[0],
+            transport=transport,
+            limiter=TokenBucket(rate=args.rps, capacity=args.rps * 2) if args.rps else None,
+            rate_limit=0,
+            metrics=metrics,
+        )
+        extractor = ContactExtractor(
+            client,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            adaptive=args.adaptive,
+            min_delay=0,
+            max_delay=0,
+            burst_delay=0,
+        )
+
+        start = time.monotonic()
+        contacts = await extractor.extract_from_payloads([BENCH_PAYLOAD], max_properties=args.limit)
+        elapsed = time.monotonic() - start
+    finally:
+        if transport:
+            await transport.close()
+        server.shutdown()
+
+    requests_sent = sum(h.count for h in metrics.latency.values())
+    # Every stand-in request gets an answer, so "none" here means the status was not read
+    statuses: Dict[str, int] = {}
+    for (_, status), count in metrics.statuses.items():
+        statuses[status] = statuses.get(status, 0) + count
+    processed = extractor._properties_processed
+    return {
+        "properties": processed,
+        "contacts": len(contacts),
+        "seconds": round(elapsed, 2),
+        "properties_per_second": round(processed / elapsed, 2) if elapsed else None,
+        "requests": requests_sent,
+        "retries": sum(metrics.retries.values()),
+        "statuses": statuses,
+        "transport": args.transport,
+        "tabs": [t["sent"] for t in dispatcher.stats()] if dispatcher else args.tabs,
+        "concurrency": extractor.controller.snapshot()["limit"] if extractor.controller else args.concurrency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction against the CoStar stand-in")
+    parser.add_argument("--properties", type=int, default=2000, help="Properties the payload matches (max)")
+    parser.add_argument("--limit", type=int, help="Stop after N properties")
+    parser.add_argument("--concurrency", type=int, default=8, help="Parallel property requests")
+    parser.add_argument("--batch-size", type=int, default=1, help="Properties per contacts GraphQL call")
+    parser.add_argument("--adaptive", action="store_true", help="Use AIMD concurrency")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=TAB, help="Tab adapter or direct HTTP transport")
+    parser.add_argument("--tabs", type=int, default=1, help="Stand-in tabs behind a least-loaded dispatcher")
+    parser.add_argument("--tab-in-flight", type=int, default=0, help="Concurrent requests one tab can carry (0 = unlimited)")
+    parser.add_argument("--rps", type=float, default=0, help="Token bucket rate (0 = no limiter)")
+    parser.add_argument("--latency", type=float, default=0.25, help="Median stand-in latency (s)")
+    parser.add_argument("--search-latency", type=float, default=1.5, help="Median list-properties latency (s)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Injected 429 probability")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected 500 probability")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="Stand-in 429s above this in-flight count")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_bench(args))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
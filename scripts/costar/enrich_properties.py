@@ -349,6 +349,7 @@ def main():
     parser.add_argument("--include-contacts", action="store_true", default=True, help="Include contact data")
     parser.add_argument("--include-loans", action="store_true", default=True, help="Include loan data")
     parser.add_argument("--delay", type=float, default=2.0, help="Delay between batches (seconds)")
+    parser.add_argument("--refresh-cache", action="store_true", help="Bypass the service's response cache and refetch")
     args = parser.parse_args()
 
     # Check service
@@ -387,6 +388,7 @@ def main():
             "include_parcel": True,
             "include_loans": args.include_loans,
             "concurrency": 5,
+            "refresh_cache": args.refresh_cache,
         })
 
         if result.get("error"):
@@ -0,0 +1,112 @@
+"""CoStar extraction - request overlap for per-property fetches."""
+
+import asyncio
+import time
+
+from integrations.costar.extract import (
+    CONTACTS_QUERY,
+    PARCEL_DETAILS_QUERY,
+    PARCEL_PINS_QUERY,
+    ContactExtractor,
+    PropertyEnricher,
+)
+
+DELAY = 0.5  # Per request; well above the extractor's own 0.05-0.15s jitter
+
+OWNER = {
+    "companyId": 7,
+    "name": "Owner LLC",
+    "contacts": [{"personId": 1, "name": "Ann Owner", "email": "ann@owner.com"}],
+}
+
+
+class SlowClient:
+    """Answers every request after DELAY seconds and records when each started."""
+
+    def __init__(self, owner=OWNER):
+        self.owner = owner
+        self.started = {}
+
+    async def _answer(self, name, value):
+        self.started[name] = time.monotonic()
+        await asyncio.sleep(DELAY)
+        return value
+
+    async def graphql(self, query, variables, operation_name=None):
+        if query == CONTACTS_QUERY:
+            info = {"trueOwner": self.owner} if self.owner else {}
+            return await self._answer("contacts", {"propertyDetail": {"propertyContactDetails_info": info}})
+        if query == PARCEL_PINS_QUERY:
+            return await self._answer("pins", {"parcelPinsFromProperty": {"parcelPins": [{"id": 99}]}})
+        if query == PARCEL_DETAILS_QUERY:
+            detail = {"parcelDetail": {"apn": "1-2-3"}, "parcelSales": {"sales": []}}
+            return await self._answer("details", {"publicRecordDetailNew": detail})
+        raise AssertionError(f"Unexpected query {query[:40]}")
+
+    async def get_property_details(self, property_id):
+        return await self._answer("pds", {"PropertyId": property_id})
+
+    def cached_response(self, endpoint, variables):
+        return None
+
+    def store_response(self, endpoint, variables, value):
+        pass
+
+
+def _timed(coro):
+    started = time.monotonic()
+    result = asyncio.run(coro)
+    return result, time.monotonic() - started
+
+
+def test_pin_lookup_overlaps_contacts():
+    client = SlowClient()
+    extractor = ContactExtractor(client, include_parcel=True, no_contacts_days=None)
+
+    contacts, elapsed = _timed(extractor._extract_property_contacts(1))
+
+    assert contacts and contacts[0]["apn"] == "1-2-3"
+    # The pin lookup goes out while the contacts query is still in flight
+    assert client.started["pins"] < client.started["contacts"] + DELAY
+    # contacts || pins, then details: two request times, not three
+    assert elapsed < DELAY * 2.8
+
+
+def test_pin_lookup_cancelled_without_contacts():
+    client = SlowClient(owner=None)
+    extractor = ContactExtractor(client, include_parcel=True, no_contacts_days=None)
+
+    async def run():
+        contacts = await extractor._extract_property_contacts(1)
+        await asyncio.sleep(DELAY * 1.5)  # Long enough for a surviving pin task to reach details
+        return contacts
+
+    contacts, _ = _timed(run())
+
+    assert contacts == []
+    assert "details" not in client.started
+
+
+def test_enricher_starts_pds_contacts_and_pins_together():
+    client = SlowClient()
+    enricher = PropertyEnricher(client)
+
+    result, elapsed = _timed(enricher._enrich_property(1))
+
+    assert result["contacts"] and result["apn"] == "1-2-3"
+    # Every independent request goes out before the first one answers
+    first = min(client.started[name] for name in ("pds", "contacts", "pins"))
+    assert max(client.started[name] for name in ("pds", "contacts", "pins")) < first + DELAY
+    assert elapsed < DELAY * 2.8
+
+
+def test_enricher_returns_only_the_pds_error():
+    client = SlowClient()
+
+    async def missing(property_id):
+        return {"error": "not_found"}
+
+    client.get_property_details = missing
+    result, _ = _timed(PropertyEnricher(client)._enrich_property(1))
+
+    assert result == {"property_id": 1, "error": "not_found"}
@@ -0,0 +1,63 @@
+"""CoStar search - concurrent pagination against the local stand-in."""
+
+import asyncio
+
+import pytest
+
+from integrations.costar.client import PAGE_SIZE, CoStarClient
+from integrations.costar.extract import ContactExtractor
+from integrations.costar.metrics import ClientMetrics
+from integrations.costar.standin import StandInData, StandInProfile, StandInTab, serve_in_thread
+
+PROFILE = StandInProfile(properties=7000, latency_median=0.001, search_latency_median=0.01)
+
+
+@pytest.fixture(scope="module")
+def standin():
+    server, url = serve_in_thread(PROFILE)
+    yield url
+    server.shutdown()
+
+
+def _payload_with_pages(minimum: int) -> dict:
+    """A payload whose stand-in result spans at least `minimum` full pages."""
+    data = StandInData(PROFILE)
+    for market in range(1, 500):
+        payload = {"0": {"Geography": {"Filter": {"Ids": [market]}}}}
+        if data.match_count(payload) >= minimum * PAGE_SIZE + 1:
+            return payload
+    raise AssertionError("No stand-in payload spans enough pages")
+
+
+async def _produce(url: str, payload: dict, max_properties: int, completed: set):
+    metrics = ClientMetrics()
+    client = CoStarClient(StandInTab(url), rate_limit=0, metrics=metrics)
+    extractor = ContactExtractor(client, concurrent_pages=True)
+    work: asyncio.Queue = asyncio.Queue()
+    await extractor._produce([payload], work, max_properties, completed)
+    queued = [property_id for chunk, _ in work._queue for property_id, _ in chunk]
+    return queued, metrics
+
+
+def test_resumed_concurrent_search_fills_the_budget(standin):
+    payload = _payload_with_pages(3)
+    all_ids, _ = asyncio.run(_produce(standin, payload, None, set()))
+
+    # A resumed run that already finished page 1 and part of page 2
+    completed = set(all_ids[:PAGE_SIZE + 500])
+    max_properties = 2 * len(completed)
+    queued, metrics = asyncio.run(_produce(standin, payload, max_properties, completed))
+
+    assert len(queued) == max_properties - len(completed)
+    assert not completed & set(queued)
+    # Pages 1-2 covered the remaining budget on paper; pages 3-4 came on demand
+    assert metrics.statuses[("search", "200")] == 4
+
+
+def test_concurrent_search_stops_at_the_budget(standin):
+    payload = _payload_with_pages(3)
+
+    queued, metrics = asyncio.run(_produce(standin, payload, PAGE_SIZE + 10, set()))
+
+    assert len(queued) == PAGE_SIZE + 10
+    assert metrics.statuses[("search", "200")] == 2
@@ -0,0 +1,70 @@
+"""CoStar session - classifying the auth check's answer."""
+
+import asyncio
+import json
+
+import pytest
+
+from integrations.costar.session import PROPERTY_COUNT_URL, CoStarSession
+
+
+class FakeResponse:
+    def __init__(self, status_code, body="", url=PROPERTY_COUNT_URL):
+        self.status_code = status_code
+        self.text = body
+        self.url = url
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeTab:
+    """Answers the auth check's POST with a fixed response."""
+
+    def __init__(self, response):
+        self.request = self
+        self.response = response
+
+    async def post(self, url, json=None):
+        return self.response
+
+
+@pytest.fixture
+def session(monkeypatch):
+    monkeypatch.setenv("COSTAR_USERNAME", "user")
+    monkeypatch.setenv("COSTAR_PW", "pw")
+    return CoStarSession()
+
+
+def _check(session, response):
+    session.tab = FakeTab(response)
+    return asyncio.run(session.check_auth())
+
+
+def test_json_answer_is_authenticated(session):
+    assert _check(session, FakeResponse(200, '{"count": 1}')) is True
+
+
+def test_server_error_with_json_is_inconclusive(session):
+    assert _check(session, FakeResponse(500, '{"error": "internal"}')) is None
+
+
+def test_maintenance_page_is_inconclusive(session):
+    assert _check(session, FakeResponse(200, "<html>maintenance</html>")) is None
+
+
+def test_missing_response_is_inconclusive(session):
+    assert _check(session, None) is None
+
+
+def test_unauthorized_is_rejected(session):
+    assert _check(session, FakeResponse(401, '{"error": "unauthorized"}')) is False
+
+
+def test_redirect_status_is_rejected(session):
+    assert _check(session, FakeResponse(302)) is False
+
+
+def test_redirect_to_sign_in_is_rejected(session):
+    response = FakeResponse(200, "<html>sign in</html>", url="https://product.costar.com/login")
+    assert _check(session, response) is False